@@ -8,21 +8,21 @@ sum = 0.0
 even = False
 i = 1.0
 while (i <= 10.0):
-    ((not even)); even = ((not even)); even
+    (even := ((not even)))
     print(i)
     if even:
         print('even')
     else:
         print('odd')
-    (sum + i); sum = (sum + i); sum
-    (i + 1.0); i = (i + 1.0); i
+    (sum := (sum + i))
+    (i := (i + 1.0))
 print('Sum 1..10:')
 print(sum)
 n = 6.0
 fact = 1.0
 while (n > 1.0):
-    (fact * n); fact = (fact * n); fact
-    (n - 1.0); n = (n - 1.0); n
+    (fact := (fact * n))
+    (n := (n - 1.0))
 print('6! =')
 print(fact)
 greeting = 'Inside block'
@@ -1,6 +1,6 @@
 #!/usr/bin/env python3
 """
-py2capla - simple, single-file Python -> .capla transpiler
+py2capla - simple Python -> .capla transpiler
 
 This implements a conservative subset of Python -> CapLang (.capla) translation.
 
@@ -22,27 +22,116 @@ Limitations:
 Usage:
   python py2capla/py2capla.py -i input.py -o out.capla
   python py2capla/py2capla.py -e 'print("hi")' -o out.capla
+  python py2capla/py2capla.py -i 'scripts/*.py' -o out_dir -j 4
 
 Author: added by assistant
 """
 import ast
 import argparse
+import glob
+import io
+import os
 import sys
-from typing import List
+from concurrent.futures import ProcessPoolExecutor
+
+
+# ast node classes bound at module scope so the hot isinstance checks are a
+# single global lookup instead of a global plus an attribute load on `ast`
+_Constant = ast.Constant
+_Name = ast.Name
+_BinOp = ast.BinOp
+_UnaryOp = ast.UnaryOp
+_Compare = ast.Compare
+_Call = ast.Call
+_BoolOp = ast.BoolOp
+_Attribute = ast.Attribute
+_Subscript = ast.Subscript
+_Not = ast.Not
+_USub = ast.USub
+_Or = ast.Or
+
+_ESC = str.maketrans({'\\': '\\\\', '"': '\\"'})
 
 
 def quote_str(s: str) -> str:
     # CapLang examples use double-quoted strings
-    return '"' + s.replace('\\', '\\\\').replace('"', '\\"') + '"'
+    if '\\' not in s and '"' not in s:
+        return '"' + s + '"'
+    return '"' + s.translate(_ESC) + '"'
+
+
+_BINOP_SYMBOLS = {
+    ast.Add: '+',
+    ast.Sub: '-',
+    ast.Mult: '*',
+    ast.Div: '/',
+    ast.Mod: '%',
+}
+
+_CMPOP_SYMBOLS = {
+    ast.Eq: '==',
+    ast.NotEq: '!=',
+    ast.Lt: '<',
+    ast.LtE: '<=',
+    ast.Gt: '>',
+    ast.GtE: '>=',
+}
 
 
 class Py2Capla(ast.NodeVisitor):
     def __init__(self):
-        self.lines: List[str] = []
+        # output goes straight into one buffer, already indented
+        self.buf = io.StringIO()
+        self.indent = 0
+        self._prefix = ''
+        # exact node type -> handler, built once instead of the per-node
+        # 'visit_' + name getattr done by ast.NodeVisitor.visit
+        self._dispatch = {
+            ast.Module: self.visit_Module,
+            ast.Expr: self.visit_Expr,
+            ast.Assign: self.visit_Assign,
+            ast.AugAssign: self.visit_AugAssign,
+            ast.FunctionDef: self.visit_FunctionDef,
+            ast.Return: self.visit_Return,
+            ast.If: self.visit_If,
+            ast.While: self.visit_While,
+            ast.For: self.visit_For,
+        }
+        self._expr_dispatch = {
+            _Constant: self._const,
+            _Name: self._name,
+            _BinOp: self._binop,
+            _UnaryOp: self._unaryop,
+            _Compare: self._compare,
+            _Call: self._call,
+            _BoolOp: self._boolop,
+            _Attribute: self._attribute,
+            _Subscript: self._subscript,
+        }
+
+    def visit(self, node: ast.AST):
+        # unknown statements fall back to generic_visit like ast.NodeVisitor does
+        return self._dispatch.get(type(node), self.generic_visit)(node)
 
     def compile(self, node: ast.AST) -> str:
         self.visit(node)
-        return "\n".join(self.lines) + "\n"
+        return self.buf.getvalue() or "\n"
+
+    def emit(self, line: str):
+        self.buf.write(self._prefix)
+        self.buf.write(line)
+        self.buf.write('\n')
+
+    def set_indent(self, level: int):
+        self.indent = level
+        self._prefix = '    ' * level
+
+    def visit_body(self, body: list):
+        # visit nested statements one indent level deeper, in the same buffer
+        self.set_indent(self.indent + 1)
+        for stmt in body:
+            self.visit(stmt)
+        self.set_indent(self.indent - 1)
 
     # --- Module / statements ---
     def visit_Module(self, node: ast.Module):
@@ -51,101 +140,86 @@ class Py2Capla(ast.NodeVisitor):
 
     def visit_Expr(self, node: ast.Expr):
         # expression statement
-        if isinstance(node.value, ast.Call) and getattr(node.value.func, 'id', None) == 'print':
+        v = node.value
+        if isinstance(v, _Call) and isinstance(v.func, _Name) and v.func.id == 'print':
             # special-case print: print arg1, arg2 -> multiple prints separated by space
-            args = node.value.args
+            args = v.args
             if not args:
-                self.lines.append('print ""')
+                self.emit('print ""')
             else:
                 # join multiple args with ' + " " + ' to emulate Python print spacing
                 compiled_args = [self.compile_expr(a) for a in args]
                 if len(compiled_args) == 1:
-                    self.lines.append(f'print {compiled_args[0]}')
+                    self.emit(f'print {compiled_args[0]}')
                 else:
                     joined = ' + " " + '.join(compiled_args)
-                    self.lines.append(f'print ({joined})')
+                    self.emit(f'print ({joined})')
             return
 
         expr = self.compile_expr(node.value)
-        self.lines.append(expr)
+        self.emit(expr)
 
     def visit_Assign(self, node: ast.Assign):
         # Support simple single-target assignments to a Name
         if len(node.targets) != 1:
             raise RuntimeError('Only single-target assignments are supported')
         target = node.targets[0]
-        if not isinstance(target, ast.Name):
+        if not isinstance(target, _Name):
             raise RuntimeError('Only simple name targets supported in assignments')
 
         name = target.id
         value = self.compile_expr(node.value)
         # Emit as var declaration for safer first-time binding
-        self.lines.append(f'var {name} = {value}')
+        self.emit(f'var {name} = {value}')
 
     def visit_AugAssign(self, node: ast.AugAssign):
-        if not isinstance(node.target, ast.Name):
+        if not isinstance(node.target, _Name):
             raise RuntimeError('Only simple name augassign supported')
         target = node.target.id
         op = self.binop_symbol(node.op)
         val = self.compile_expr(node.value)
-        self.lines.append(f'{target} = ({target} {op} {val})')
+        self.emit(f'{target} = ({target} {op} {val})')
 
     def visit_FunctionDef(self, node: ast.FunctionDef):
         name = node.name
         params = [arg.arg for arg in node.args.args]
         param_list = ', '.join(params)
-        self.lines.append(f'def {name}({param_list}) {{')
-        # body: compile into inner lines with indentation
-        inner = Py2Capla()
-        for stmt in node.body:
-            inner.visit(stmt)
+        self.emit(f'def {name}({param_list}) {{')
+        start = self.buf.tell()
+        self.visit_body(node.body)
         # ensure non-empty body
-        if not inner.lines:
-            self.lines.append('    pass')
-        else:
-            for l in inner.lines:
-                self.lines.append('    ' + l)
-        self.lines.append('}')
+        if self.buf.tell() == start:
+            self.emit('    pass')
+        self.emit('}')
 
     def visit_Return(self, node: ast.Return):
         if node.value is None:
-            self.lines.append('return')
+            self.emit('return')
         else:
-            self.lines.append(f'return {self.compile_expr(node.value)}')
+            self.emit(f'return {self.compile_expr(node.value)}')
 
     def visit_If(self, node: ast.If):
         cond = self.compile_expr(node.test)
-        self.lines.append(f'if ({cond}) {{')
-        inner = Py2Capla()
-        for s in node.body:
-            inner.visit(s)
-        for l in inner.lines:
-            self.lines.append('    ' + l)
-        self.lines.append('}')
+        self.emit(f'if ({cond}) {{')
+        self.visit_body(node.body)
+        self.emit('}')
         if node.orelse:
-            self.lines.append('else {')
-            inner2 = Py2Capla()
-            for s in node.orelse:
-                inner2.visit(s)
-            for l in inner2.lines:
-                self.lines.append('    ' + l)
-            self.lines.append('}')
+            self.emit('else {')
+            self.visit_body(node.orelse)
+            self.emit('}')
 
     def visit_While(self, node: ast.While):
         cond = self.compile_expr(node.test)
-        self.lines.append(f'while ({cond}) {{')
-        inner = Py2Capla()
-        for s in node.body:
-            inner.visit(s)
-        for l in inner.lines:
-            self.lines.append('    ' + l)
-        self.lines.append('}')
+        self.emit(f'while ({cond}) {{')
+        self.visit_body(node.body)
+        self.emit('}')
 
     def visit_For(self, node: ast.For):
         # Only support 'for <name> in range(...)' patterns and translate to var+while
-        if not isinstance(node.target, ast.Name):
+        if not isinstance(node.target, _Name):
             raise RuntimeError('Only simple for-loop targets supported')
-        if not isinstance(node.iter, ast.Call) or getattr(node.iter.func, 'id', None) != 'range':
+        it = node.iter
+        if not (isinstance(it, _Call) and isinstance(it.func, _Name) and it.func.id == 'range'):
             raise RuntimeError('Only for-loops over range(...) are supported')
 
         args = node.iter.args
@@ -165,111 +239,94 @@ class Py2Capla(ast.NodeVisitor):
             raise RuntimeError('range() with too many args')
 
         varname = node.target.id
-        self.lines.append(f'var {varname} = {start}')
+        self.emit(f'var {varname} = {start}')
         # condition depends on sign of step; assume positive step for simplicity
-        self.lines.append(f'while ({varname} < {stop}) {{')
-        inner = Py2Capla()
-        for s in node.body:
-            inner.visit(s)
+        self.emit(f'while ({varname} < {stop}) {{')
+        self.visit_body(node.body)
         # increment
-        inner.lines.append(f'{varname} = ({varname} + {step})')
-        for l in inner.lines:
-            self.lines.append('    ' + l)
-        self.lines.append('}')
+        self.emit(f'    {varname} = ({varname} + {step})')
+        self.emit('}')
 
     # --- Expressions ---
     def compile_expr(self, node: ast.AST) -> str:
-        if isinstance(node, ast.Constant):
-            v = node.value
-            if v is None:
-                return 'nil'
-            if isinstance(v, bool):
-                return 'true' if v else 'false'
-            if isinstance(v, (int, float)):
-                return repr(v)
-            if isinstance(v, str):
-                return quote_str(v)
-            raise RuntimeError(f'Unsupported constant: {v!r}')
-
-        if isinstance(node, ast.Name):
-            return node.id
-
-        if isinstance(node, ast.BinOp):
-            left = self.compile_expr(node.left)
-            right = self.compile_expr(node.right)
-            op = self.binop_symbol(node.op)
-            return f'({left} {op} {right})'
-
-        if isinstance(node, ast.UnaryOp):
-            if isinstance(node.op, ast.Not):
-                return f'!{self.compile_expr(node.operand)}'
-            if isinstance(node.op, ast.USub):
-                return f'-{self.compile_expr(node.operand)}'
-            raise RuntimeError('Unsupported unary operator')
-
-        if isinstance(node, ast.Compare):
-            # Only single comparator supported (common case)
-            if len(node.ops) != 1 or len(node.comparators) != 1:
-                raise RuntimeError('Only simple comparisons supported')
-            left = self.compile_expr(node.left)
-            op = self.cmpop_symbol(node.ops[0])
-            right = self.compile_expr(node.comparators[0])
-            return f'({left} {op} {right})'
-
-        if isinstance(node, ast.Call):
-            # simple function call
-            func = node.func
-            if isinstance(func, ast.Name):
-                fname = func.id
-            else:
-                # support attribute calls like obj.method
-                fname = self.compile_expr(func)
-
-            args = [self.compile_expr(a) for a in node.args]
-            return f"{fname}({', '.join(args)})"
+        handler = self._expr_dispatch.get(type(node))
+        if handler is None:
+            raise RuntimeError(f'Unsupported expression node: {type(node)}')
+        return handler(node)
+
+    def _const(self, node: ast.Constant) -> str:
+        v = node.value
+        if v is None:
+            return 'nil'
+        if isinstance(v, bool):
+            return 'true' if v else 'false'
+        if isinstance(v, (int, float)):
+            return repr(v)
+        if isinstance(v, str):
+            return quote_str(v)
+        raise RuntimeError(f'Unsupported constant: {v!r}')
+
+    def _name(self, node: ast.Name) -> str:
+        return node.id
+
+    def _binop(self, node: ast.BinOp) -> str:
+        left = self.compile_expr(node.left)
+        right = self.compile_expr(node.right)
+        op = self.binop_symbol(node.op)
+        return f'({left} {op} {right})'
+
+    def _unaryop(self, node: ast.UnaryOp) -> str:
+        if isinstance(node.op, _Not):
+            return f'!{self.compile_expr(node.operand)}'
+        if isinstance(node.op, _USub):
+            return f'-{self.compile_expr(node.operand)}'
+        raise RuntimeError('Unsupported unary operator')
+
+    def _compare(self, node: ast.Compare) -> str:
+        # Only single comparator supported (common case)
+        if len(node.ops) != 1 or len(node.comparators) != 1:
+            raise RuntimeError('Only simple comparisons supported')
+        left = self.compile_expr(node.left)
+        op = self.cmpop_symbol(node.ops[0])
+        right = self.compile_expr(node.comparators[0])
+        return f'({left} {op} {right})'
+
+    def _call(self, node: ast.Call) -> str:
+        # simple function call
+        func = node.func
+        if isinstance(func, _Name):
+            fname = func.id
+        else:
+            # support attribute calls like obj.method
+            fname = self.compile_expr(func)
 
-        if isinstance(node, ast.BoolOp):
-            # conservative translation: join with '||'/'&&' (note: CapLang lexer/parser may not support these tokens fully)
-            op = ' || ' if isinstance(node.op, ast.Or) else ' && '
-            parts = [self.compile_expr(v) for v in node.values]
-            return '(' + op.join(parts) + ')'
+        args = [self.compile_expr(a) for a in node.args]
+        return f"{fname}({', '.join(args)})"
 
-        if isinstance(node, ast.Attribute):
-            return f"{self.compile_expr(node.value)}.{node.attr}"
+    def _boolop(self, node: ast.BoolOp) -> str:
+        # conservative translation: join with '||'/'&&' (note: CapLang lexer/parser may not support these tokens fully)
+        op = ' || ' if isinstance(node.op, _Or) else ' && '
+        parts = [self.compile_expr(v) for v in node.values]
+        return '(' + op.join(parts) + ')'
 
-        if isinstance(node, ast.Subscript):
-            # simple subscription a[b]
-            return f"{self.compile_expr(node.value)}[{self.compile_expr(node.slice.value if isinstance(node.slice, ast.Index) else node.slice)}]"
+    def _attribute(self, node: ast.Attribute) -> str:
+        return f"{self.compile_expr(node.value)}.{node.attr}"
 
-        raise RuntimeError(f'Unsupported expression node: {type(node)}')
+    def _subscript(self, node: ast.Subscript) -> str:
+        # simple subscription a[b]
+        return f"{self.compile_expr(node.value)}[{self.compile_expr(node.slice)}]"
 
     def binop_symbol(self, op: ast.AST) -> str:
-        if isinstance(op, ast.Add):
-            return '+'
-        if isinstance(op, ast.Sub):
-            return '-'
-        if isinstance(op, ast.Mult):
-            return '*'
-        if isinstance(op, ast.Div):
-            return '/'
-        if isinstance(op, ast.Mod):
-            return '%'
-        raise RuntimeError(f'Unsupported binary op: {op}')
+        sym = _BINOP_SYMBOLS.get(type(op))
+        if sym is None:
+            raise RuntimeError(f'Unsupported binary op: {op}')
+        return sym
 
     def cmpop_symbol(self, op: ast.AST) -> str:
-        if isinstance(op, ast.Eq):
-            return '=='
-        if isinstance(op, ast.NotEq):
-            return '!='
-        if isinstance(op, ast.Lt):
-            return '<'
-        if isinstance(op, ast.LtE):
-            return '<='
-        if isinstance(op, ast.Gt):
-            return '>'
-        if isinstance(op, ast.GtE):
-            return '>='
-        raise RuntimeError(f'Unsupported comparison op: {op}')
+        sym = _CMPOP_SYMBOLS.get(type(op))
+        if sym is None:
+            raise RuntimeError(f'Unsupported comparison op: {op}')
+        return sym
 
 
 def transpile_source(source: str) -> str:
@@ -278,16 +335,81 @@ def transpile_source(source: str) -> str:
     return compiler.compile(tree)
 
 
+def expand_inputs(patterns: list) -> list:
+    # accept plain paths as well as glob patterns (for shells that don't expand them)
+    paths = []
+    for pattern in patterns:
+        if glob.has_magic(pattern):
+            paths.extend(sorted(glob.glob(pattern)))
+        else:
+            paths.append(pattern)
+    return paths
+
+
+def output_path(path: str, out_dir: str = None) -> str:
+    # <input>.capla next to the input, or <basename>.capla inside out_dir
+    out = os.path.splitext(path)[0] + '.capla'
+    if out_dir:
+        out = os.path.join(out_dir, os.path.basename(out))
+    return out
+
+
+def duplicate_outputs(paths: list, out_dir: str = None) -> list:
+    # outputs that more than one input would be written to
+    seen = {}
+    for path in paths:
+        out = output_path(path, out_dir)
+        seen.setdefault(os.path.normcase(os.path.abspath(out)), []).append(path)
+    return [(out, inputs) for out, inputs in seen.items() if len(inputs) > 1]
+
+
+def transpile_files(paths: list, out_dir: str = None, jobs: int = None):
+    sources = []
+    for path in paths:
+        with open(path, 'r', encoding='utf-8') as f:
+            sources.append(f.read())
+
+    # each file is an independent, CPU-bound AST walk, so farm them out to
+    # worker processes rather than threads (which would serialize on the GIL)
+    with ProcessPoolExecutor(max_workers=jobs) as ex:
+        for path, cap_src in zip(paths, ex.map(transpile_source, sources)):
+            out = output_path(path, out_dir)
+            with open(out, 'w', encoding='utf-8') as f:
+                f.write(cap_src)
+            print(f'Wrote {out}')
+
+
 def main(argv=None):
-    p = argparse.ArgumentParser(description='Simple Python -> .capla transpiler (single-file)')
+    p = argparse.ArgumentParser(description='Simple Python -> .capla transpiler')
     group = p.add_mutually_exclusive_group(required=True)
-    group.add_argument('-i', '--input', help='Input Python file')
+    group.add_argument('-i', '--input', nargs='+', action='extend', help='Input Python file(s) or glob pattern(s)')
     group.add_argument('-e', '--expr', help='Inline Python expression/script')
-    p.add_argument('-o', '--output', help='Output .capla file (defaults to stdout)')
+    p.add_argument('-o', '--output', help='Output .capla file (defaults to stdout); a directory for globs or several inputs')
+    p.add_argument('-j', '--jobs', type=int, default=None, help='Worker processes for multi-file input (defaults to CPU count)')
     args = p.parse_args(argv)
+    if args.jobs is not None and args.jobs < 1:
+        p.error('-j/--jobs must be at least 1')
 
     if args.input:
-        with open(args.input, 'r', encoding='utf-8') as f:
+        paths = expand_inputs(args.input)
+        # a glob, several -i values or an existing -o directory mean directory
+        # mode, even when only one file matched
+        many = (len(args.input) > 1
+                or any(glob.has_magic(pattern) for pattern in args.input)
+                or bool(args.output and os.path.isdir(args.output)))
+        if not paths:
+            p.error('no input files matched')
+        if many:
+            # several inputs: write one .capla per input, next to it or into -o
+            clashes = duplicate_outputs(paths, args.output)
+            if clashes:
+                p.error('several inputs would write the same output: ' + '; '.join(
+                    f"{out} <- {', '.join(inputs)}" for out, inputs in clashes))
+            if args.output:
+                os.makedirs(args.output, exist_ok=True)
+            transpile_files(paths, args.output, args.jobs)
+            return
+        with open(paths[0], 'r', encoding='utf-8') as f:
             src = f.read()
     else:
         src = args.expr
@@ -1,3 +1,5 @@
+import io
+import sys
 from typing import List
 from parser import (
     Binary, Grouping, Literal, Unary, Variable, Expr,
@@ -6,99 +8,148 @@ from parser import (
 )
 from lexer import TokenType
 
-
-def indent_lines(lines: List[str], level: int = 1) -> List[str]:
-    prefix = '    ' * level
-    return [prefix + l for l in lines]
+# precomputed indentation prefixes, indexed by nesting level
+_INDENT = tuple('    ' * i for i in range(64))
+
+# operator token -> interned ' op ' spelling spliced between the operands;
+# an f-string over these is cheaper than str.format on a template
+_BINOP_SYM = {
+    TokenType.PLUS: sys.intern(' + '),
+    TokenType.MINUS: sys.intern(' - '),
+    TokenType.STAR: sys.intern(' * '),
+    TokenType.SLASH: sys.intern(' / '),
+    TokenType.EQUAL_EQUAL: sys.intern(' == '),
+    TokenType.BANG_EQUAL: sys.intern(' != '),
+    TokenType.LESS: sys.intern(' < '),
+    TokenType.LESS_EQUAL: sys.intern(' <= '),
+    TokenType.GREATER: sys.intern(' > '),
+    TokenType.GREATER_EQUAL: sys.intern(' >= '),
+}
+
+# upper bound on memoized literal renderings kept by a Compiler
+_LIT_CACHE_MAX = 4096
+
+_UNARY_PREFIX = {
+    TokenType.MINUS: sys.intern('(-'),
+    TokenType.BANG: sys.intern('(not '),
+}
+
+
+def expr_children(expr: Expr) -> tuple:
+    # sub-expressions of a non-leaf node, in evaluation order
+    if isinstance(expr, Binary):
+        return (expr.left, expr.right)
+    if isinstance(expr, Grouping):
+        return (expr.expression,)
+    if isinstance(expr, Unary):
+        return (expr.right,)
+    if isinstance(expr, Get):
+        return (expr.object,)
+    if isinstance(expr, Call):
+        return (expr.callee, *expr.arguments)
+    if isinstance(expr, Assign):
+        return (expr.value,)
+    raise Exception(f"Unknown expression type: {type(expr)}")
 
 
 class Compiler:
     def __init__(self):
         # track whether generated code needs the `time` module
         self.needs_time = False
+        # rendered source text for literals already seen, keyed by (type, value)
+        self._lit_cache = {}
+        # statement class -> handler; the parser emits exact node types
+        self._stmt_handlers = {
+            ImportStmt: self._compile_import,
+            PrintStmt: self._compile_print,
+            VarStmt: self._compile_var,
+            ExpressionStmt: self._compile_exprstmt,
+            BlockStmt: self._compile_block,
+            IfStmt: self._compile_if,
+            WhileStmt: self._compile_while,
+            FunctionStmt: self._compile_func,
+            Return: self._compile_return,
+        }
 
     def compile_expr(self, expr: Expr) -> str:
-        if isinstance(expr, Binary):
-            return self.compile_binary(expr)
-        elif isinstance(expr, Grouping):
-            return self.compile_grouping(expr)
-        elif isinstance(expr, Literal):
-            return self.compile_literal(expr)
-        elif isinstance(expr, Unary):
-            return self.compile_unary(expr)
-        elif isinstance(expr, Variable):
-            return self.compile_variable(expr)
-        elif isinstance(expr, Get):
-            return self.compile_get(expr)
-        elif isinstance(expr, Call):
-            return self.compile_call(expr)
-        elif isinstance(expr, Assign):
-            # assignment expression compiles to a simple Python assignment and returns the variable name
-            name = expr.name.lexeme
-            value = self.compile_expr(expr.value)
-            return f"({name} := {value})" if False else f"{value}; {name} = {value}; {name}"
-
-        raise Exception(f"Unknown expression type: {type(expr)}")
-
-    def compile_binary(self, expr: Binary) -> str:
-        left = self.compile_expr(expr.left)
-        right = self.compile_expr(expr.right)
-        operator = expr.operator.type
-
-        if operator == TokenType.PLUS:
-            return f"({left} + {right})"
-        elif operator == TokenType.MINUS:
-            return f"({left} - {right})"
-        elif operator == TokenType.STAR:
-            return f"({left} * {right})"
-        elif operator == TokenType.SLASH:
-            return f"({left} / {right})"
-        elif operator == TokenType.EQUAL_EQUAL:
-            return f"({left} == {right})"
-        elif operator == TokenType.BANG_EQUAL:
-            return f"({left} != {right})"
-        elif operator == TokenType.LESS:
-            return f"({left} < {right})"
-        elif operator == TokenType.LESS_EQUAL:
-            return f"({left} <= {right})"
-        elif operator == TokenType.GREATER:
-            return f"({left} > {right})"
-        elif operator == TokenType.GREATER_EQUAL:
-            return f"({left} >= {right})"
-
-        raise Exception(f"Unknown binary operator: {operator}")
-
-    def compile_grouping(self, expr: Grouping) -> str:
-        return f"({self.compile_expr(expr.expression)})"
+        # Iterative post-order walk so deeply nested expressions don't cost a
+        # Python frame per node: each inner node is pushed once to schedule its
+        # children and again (ready=True) to combine their compiled text.
+        work = [(expr, False)]
+        results: List[str] = []
+        while work:
+            node, ready = work.pop()
+            if isinstance(node, Literal):
+                results.append(self.compile_literal(node))
+            elif isinstance(node, Variable):
+                results.append(self.compile_variable(node))
+            elif not ready:
+                work.append((node, True))
+                work.extend((child, False) for child in reversed(expr_children(node)))
+            elif isinstance(node, Binary):
+                right = results.pop()
+                left = results.pop()
+                results.append(self.compile_binary(node, left, right))
+            elif isinstance(node, Grouping):
+                results.append(self.compile_grouping(node, results.pop()))
+            elif isinstance(node, Unary):
+                results.append(self.compile_unary(node, results.pop()))
+            elif isinstance(node, Get):
+                results.append(self.compile_get(node, results.pop()))
+            elif isinstance(node, Call):
+                split = len(results) - len(node.arguments)
+                args = results[split:]
+                del results[split:]
+                results.append(self.compile_call(node, results.pop(), args))
+            elif isinstance(node, Assign):
+                results.append(self.compile_assign(node, results.pop()))
+        return results[0]
+
+    def compile_binary(self, expr: Binary, left: str, right: str) -> str:
+        op = _BINOP_SYM.get(expr.operator.type)
+        if op is None:
+            raise Exception(f"Unknown binary operator: {expr.operator.type}")
+        return f"({left}{op}{right})"
+
+    def compile_grouping(self, expr: Grouping, inner: str) -> str:
+        return f"({inner})"
 
     def compile_literal(self, expr: Literal) -> str:
-        if expr.value is None:
-            return "None"
+        value = expr.value
+        key = (type(value), value)
+        s = self._lit_cache.get(key)
+        if s is not None:
+            return s
+
+        if value is None:
+            s = "None"
         # Strings need to be quoted for valid Python syntax
-        if isinstance(expr.value, str):
-            return repr(expr.value)
-        return str(expr.value)
-
-    def compile_unary(self, expr: Unary) -> str:
-        right = self.compile_expr(expr.right)
-        if expr.operator.type == TokenType.MINUS:
-            return f"(-{right})"
-        elif expr.operator.type == TokenType.BANG:
-            return f"(not {right})"
-
-        raise Exception(f"Unknown unary operator: {expr.operator.type}")
+        elif isinstance(value, str):
+            s = repr(value)
+        else:
+            s = str(value)
+
+        # keep the cache bounded for programs with many distinct constants
+        if len(self._lit_cache) >= _LIT_CACHE_MAX:
+            self._lit_cache.clear()
+        self._lit_cache[key] = s
+        return s
+
+    def compile_unary(self, expr: Unary, right: str) -> str:
+        prefix = _UNARY_PREFIX.get(expr.operator.type)
+        if prefix is None:
+            raise Exception(f"Unknown unary operator: {expr.operator.type}")
+        return f"{prefix}{right})"
 
     def compile_variable(self, expr: Variable) -> str:
         return expr.name.lexeme
 
-    def compile_get(self, expr: Get) -> str:
-        obj = self.compile_expr(expr.object)
+    def compile_get(self, expr: Get, obj: str) -> str:
         name = expr.name.lexeme
         return f"{obj}.{name}"
 
-    def compile_call(self, expr: Call) -> str:
-        callee = self.compile_expr(expr.callee)
-        args = ", ".join(self.compile_expr(a) for a in expr.arguments)
+    def compile_call(self, expr: Call, callee: str, args: List[str]) -> str:
+        args = ", ".join(args)
         # Map runtime `sleep(...)` calls to Python's `time.sleep(...)` in compiled output.
         # If the callee is the bare name 'sleep', emit time.sleep(...) and mark
         # that we need to import the time module at the top of the generated file.
@@ -108,81 +159,93 @@ class Compiler:
 
         return f"{callee}({args})"
 
+    def compile_assign(self, expr: Assign, value: str) -> str:
+        # assignment is an expression in CapLang, so compile it to a walrus
+        # which evaluates the value once and yields it
+        name = expr.name.lexeme
+        return f"({name} := {value})"
+
     # --- Statement compilation ---
-    def compile_stmt(self, stmt: Stmt) -> List[str]:
-        if isinstance(stmt, ImportStmt):
-            # Preserve dotted import paths from CapLang so generated Python mirrors
-            # the original Java-style imports (e.g. `import org.bukkit.Bukkit`).
-            parts = [p.lexeme for p in stmt.path]
-            dotted = ".".join(parts)
-            return [f"import {dotted}"]
-        
-        if isinstance(stmt, PrintStmt):
-            return [f"print({self.compile_expr(stmt.expression)})"]
-        if isinstance(stmt, VarStmt):
-            name = stmt.name.lexeme
-            if stmt.initializer is not None:
-                return [f"{name} = {self.compile_expr(stmt.initializer)}"]
-            return [f"{name} = None"]
-        if isinstance(stmt, ExpressionStmt):
-            # evaluate expression for side-effects
-            return [f"{self.compile_expr(stmt.expression)}"]
-        if isinstance(stmt, BlockStmt):
-            lines: List[str] = []
-            for s in stmt.statements:
-                lines.extend(self.compile_stmt(s))
-            return lines
-        if isinstance(stmt, IfStmt):
-            cond = self.compile_expr(stmt.condition)
-            then_lines = self.compile_stmt_block(stmt.then_branch)
-            lines = [f"if {cond}:"]
-            lines.extend(indent_lines(then_lines))
-            if stmt.else_branch is not None:
-                else_lines = self.compile_stmt_block(stmt.else_branch)
-                lines.append("else:")
-                lines.extend(indent_lines(else_lines))
-            return lines
-        if isinstance(stmt, WhileStmt):
-            cond = self.compile_expr(stmt.condition)
-            body_lines = self.compile_stmt_block(stmt.body)
-            lines = [f"while {cond}:"]
-            lines.extend(indent_lines(body_lines))
-            return lines
-
-        if isinstance(stmt, FunctionStmt):
-            name = stmt.name.lexeme
-            params = ", ".join(p.lexeme for p in stmt.params)
-            lines = [f"def {name}({params}):"]
-            body_lines: List[str] = []
-            for s in stmt.body:
-                body_lines.extend(self.compile_stmt(s))
-            if not body_lines:
-                body_lines = ["pass"]
-            lines.extend(indent_lines(body_lines))
-            return lines
-        if isinstance(stmt, Return):
-            if stmt.value is None:
-                return ["return"]
-            return [f"return {self.compile_expr(stmt.value)}"]
-
-        raise Exception(f"Can't compile statement type: {type(stmt)}")
-
-    def compile_stmt_block(self, stmt: Stmt) -> List[str]:
-        # helper to produce a list of lines for a statement or block
+    def emit(self, writer: io.StringIO, indent: int, line: str):
+        writer.write(_INDENT[indent] if indent < len(_INDENT) else '    ' * indent)
+        writer.write(line)
+        writer.write('\n')
+
+    def compile_stmt(self, stmt: Stmt, writer: io.StringIO, indent: int = 0):
+        handler = self._stmt_handlers.get(type(stmt))
+        if handler is None:
+            raise Exception(f"Can't compile statement type: {type(stmt)}")
+        handler(stmt, writer, indent)
+
+    def _compile_import(self, stmt: ImportStmt, writer: io.StringIO, indent: int):
+        # Preserve dotted import paths from CapLang so generated Python mirrors
+        # the original Java-style imports (e.g. `import org.bukkit.Bukkit`).
+        parts = [p.lexeme for p in stmt.path]
+        dotted = ".".join(parts)
+        self.emit(writer, indent, f"import {dotted}")
+
+    def _compile_print(self, stmt: PrintStmt, writer: io.StringIO, indent: int):
+        self.emit(writer, indent, f"print({self.compile_expr(stmt.expression)})")
+
+    def _compile_var(self, stmt: VarStmt, writer: io.StringIO, indent: int):
+        name = stmt.name.lexeme
+        if stmt.initializer is not None:
+            self.emit(writer, indent, f"{name} = {self.compile_expr(stmt.initializer)}")
+        else:
+            self.emit(writer, indent, f"{name} = None")
+
+    def _compile_exprstmt(self, stmt: ExpressionStmt, writer: io.StringIO, indent: int):
+        # evaluate expression for side-effects
+        self.emit(writer, indent, f"{self.compile_expr(stmt.expression)}")
+
+    def _compile_block(self, stmt: BlockStmt, writer: io.StringIO, indent: int):
+        for s in stmt.statements:
+            self.compile_stmt(s, writer, indent)
+
+    def _compile_if(self, stmt: IfStmt, writer: io.StringIO, indent: int):
+        cond = self.compile_expr(stmt.condition)
+        self.emit(writer, indent, f"if {cond}:")
+        self.compile_stmt_block(stmt.then_branch, writer, indent + 1)
+        if stmt.else_branch is not None:
+            self.emit(writer, indent, "else:")
+            self.compile_stmt_block(stmt.else_branch, writer, indent + 1)
+
+    def _compile_while(self, stmt: WhileStmt, writer: io.StringIO, indent: int):
+        cond = self.compile_expr(stmt.condition)
+        self.emit(writer, indent, f"while {cond}:")
+        self.compile_stmt_block(stmt.body, writer, indent + 1)
+
+    def _compile_func(self, stmt: FunctionStmt, writer: io.StringIO, indent: int):
+        name = stmt.name.lexeme
+        params = ", ".join(p.lexeme for p in stmt.params)
+        self.emit(writer, indent, f"def {name}({params}):")
+        start = writer.tell()
+        for s in stmt.body:
+            self.compile_stmt(s, writer, indent + 1)
+        if writer.tell() == start:
+            self.emit(writer, indent + 1, "pass")
+
+    def _compile_return(self, stmt: Return, writer: io.StringIO, indent: int):
+        if stmt.value is None:
+            self.emit(writer, indent, "return")
+        else:
+            self.emit(writer, indent, f"return {self.compile_expr(stmt.value)}")
+
+    def compile_stmt_block(self, stmt: Stmt, writer: io.StringIO, indent: int):
+        # helper to write a statement or the contents of a block
         if isinstance(stmt, BlockStmt):
-            lines: List[str] = []
             for s in stmt.statements:
-                lines.extend(self.compile_stmt(s))
-            return lines
-        return self.compile_stmt(stmt)
+                self.compile_stmt(s, writer, indent)
+            return
+        self.compile_stmt(stmt, writer, indent)
 
     def compile_program(self, statements: List[Stmt]) -> str:
-        lines: List[str] = []
+        writer = io.StringIO()
         for s in statements:
-            lines.extend(self.compile_stmt(s))
+            self.compile_stmt(s, writer)
+        source = writer.getvalue()[:-1]
         # If compiled code used time.sleep, emit a top-level import
         if getattr(self, 'needs_time', False):
-            lines.insert(0, 'import time')
+            source = 'import time\n' + source if source else 'import time'
 
-        # join lines into Python source
-        return "\n".join(lines)
\ No newline at end of file
+        return source
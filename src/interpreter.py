@@ -1,46 +1,219 @@
 from typing import Any, List
-from lexer import Token, TokenType
+from lexer import Lexer, Token, TokenType
 from parser import (
     Binary, Grouping, Literal, Unary, Variable, Expr, Assign,
     Stmt, ExpressionStmt, PrintStmt, VarStmt, BlockStmt, IfStmt, WhileStmt, ImportStmt, Call, Get,
-    FunctionStmt, Return, TryStmt
+    FunctionStmt, Return, TryStmt, Parser
 )
+from resolver import Resolver
+from numeric import try_compile
 import time
 from types import SimpleNamespace
 import os
+import pickle
 import sys
-from typing import Any, List
 
 
-class ReturnException(Exception):
-    def __init__(self, value):
-        self.value = value
+# Statement handlers return None normally and _RETURN while a `return` is
+# unwinding; the returned value is parked on Interpreter.return_value.
+_RETURN = 1
+
+
+# Operator implementations; Binary/Unary nodes cache theirs on first evaluation
+def _unary_minus(right: Any) -> Any:
+    return -float(right)
+
+
+def _unary_bang(right: Any) -> bool:
+    # only nil and false are falsy (see is_truthy)
+    return right is None or right is False
+
+
+def _binary_minus(left: Any, right: Any) -> Any:
+    return float(left) - float(right)
+
+
+def _binary_slash(left: Any, right: Any) -> Any:
+    return float(left) / float(right)
+
+
+def _binary_star(left: Any, right: Any) -> Any:
+    return float(left) * float(right)
+
+
+def _binary_plus(left: Any, right: Any) -> Any:
+    # fast path: number + number or string + string of the same exact type
+    t = type(left)
+    if t is type(right) and (t is float or t is str):
+        return left + right
+    if isinstance(left, (int, float)) and isinstance(right, (int, float)):
+        return left + right
+    if isinstance(left, str) and isinstance(right, str):
+        return left + right
+    raise RuntimeError("Operands must be two numbers or two strings")
+
+
+def _binary_greater(left: Any, right: Any) -> bool:
+    return float(left) > float(right)
+
+
+def _binary_greater_equal(left: Any, right: Any) -> bool:
+    return float(left) >= float(right)
+
+
+def _binary_less(left: Any, right: Any) -> bool:
+    return float(left) < float(right)
+
+
+def _binary_less_equal(left: Any, right: Any) -> bool:
+    return float(left) <= float(right)
+
+
+def _binary_bang_equal(left: Any, right: Any) -> bool:
+    # is_equal inlined: nil only equals nil
+    if left is None:
+        return right is not None
+    return not left == right
+
+
+def _binary_equal_equal(left: Any, right: Any) -> bool:
+    if left is None:
+        return right is None
+    return left == right
+
+
+_UNARY_OPS = {
+    TokenType.MINUS: _unary_minus,
+    TokenType.BANG: _unary_bang,
+}
+
+_BINARY_OPS = {
+    TokenType.MINUS: _binary_minus,
+    TokenType.SLASH: _binary_slash,
+    TokenType.STAR: _binary_star,
+    TokenType.PLUS: _binary_plus,
+    TokenType.GREATER: _binary_greater,
+    TokenType.GREATER_EQUAL: _binary_greater_equal,
+    TokenType.LESS: _binary_less,
+    TokenType.LESS_EQUAL: _binary_less_equal,
+    TokenType.BANG_EQUAL: _binary_bang_equal,
+    TokenType.EQUAL_EQUAL: _binary_equal_equal,
+}
+
+
+def _to_int(value: Any) -> Any:
+    # prefer int when possible, fall back to converting to float
+    try:
+        return int(value)
+    except Exception:
+        try:
+            return int(float(value))
+        except Exception:
+            return float(value)
+
+
+def _to_bool(value: Any) -> bool:
+    if isinstance(value, bool):
+        return value
+    if isinstance(value, str):
+        v = value.strip().lower()
+        if v in ('true', '1', 'yes'):
+            return True
+        if v in ('false', '0', 'no'):
+            return False
+    return bool(value)
+
+
+# declared type name (lowercased) -> conversion used by coerce_value
+_COERCERS = {
+    'int': _to_int,
+    'float': float,
+    'string': str,
+    'str': str,
+    'bool': _to_bool,
+}
+
+# Python modules imported under a CapLang alias (e.g. `import tk`)
+_PY_ALIASES = {
+    'tk': 'tkinter',
+}
+
+# where `import` looks for .capla modules besides the working directory
+_REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+_EXAMPLES_DIR = os.path.join(_REPO_ROOT, 'examples')
+
+# stored with each pickled module AST in __pycache__; bump it whenever the AST
+# node classes change shape so caches written by older code are reparsed
+_AST_CACHE_VERSION = 5
+
+
+class CapModule(SimpleNamespace):
+    """Globals of an imported .capla module, exposed as attributes.
+
+    Its own type (rather than a plain SimpleNamespace, which Python code may
+    hand over and mutate) marks it as a snapshot nothing rebinds, so attribute
+    reads on it can be cached.
+    """
+
+    def __repr__(self) -> str:
+        # printed like the plain namespace modules used to be
+        items = ', '.join(f'{k}={v!r}' for k, v in vars(self).items())
+        return f'namespace({items})'
 
 
 class FunctionCallable:
+    __slots__ = ('declaration', 'closure', 'param_names', 'body', 'native', 'env_pool')
+
     def __init__(self, declaration: FunctionStmt, closure: 'Environment'):
         self.declaration = declaration
         self.closure = closure
+        # pulled off the declaration once so calls don't go through it
+        self.param_names = declaration.param_names
+        self.body = declaration.body
+        # compiled Python version for float-only calls (see numeric.py), or None
+        self.native = getattr(declaration, 'native', None)
+        # environments of finished calls, ready for the next one; None when a
+        # nested function or import could keep a call's environment alive
+        self.env_pool = [] if declaration.reuse_env else None
 
     def arity(self) -> int:
-        return len(self.declaration.params)
+        return len(self.param_names)
 
     def call(self, interpreter: 'Interpreter', args: List):
-        env = Environment(self.closure)
-        # bind parameters
-        for i, param in enumerate(self.declaration.params):
-            name = param.lexeme
-            value = args[i] if i < len(args) else None
-            env.define(name, value)
+        native = self.native
+        if native is not None and len(args) == len(self.param_names):
+            for arg in args:
+                if type(arg) is not float:
+                    break
+            else:
+                return native(*args)
 
-        try:
-            interpreter.execute_block(self.declaration.body, env)
-        except ReturnException as r:
-            return r.value
-        return None
+        pool = self.env_pool
+        if pool:
+            env = pool.pop()
+        else:
+            env = Environment(self.closure)
+        # bind parameters straight into the new frame
+        values = env.values
+        n = len(args)
+        for i, name in enumerate(self.param_names):
+            values[name] = args[i] if i < n else None
+
+        value = None
+        if interpreter.execute_block(self.body, env):
+            value = interpreter.return_value
+            interpreter.return_value = None
+        # a call that raised simply doesn't hand its environment back
+        if pool is not None:
+            values.clear()
+            env.types.clear()
+            pool.append(env)
+        return value
 
 
 class Environment:
+    __slots__ = ('values', 'types', 'enclosing')
+
     def __init__(self, enclosing: 'Environment' = None):
         self.values = {}
         # optional declared types for variables in this environment
@@ -50,27 +223,41 @@ class Environment:
     def define(self, name: str, value: Any):
         self.values[name] = value
 
+    # Lookups walk the enclosing chain in a loop rather than recursing, so a
+    # name found several scopes up costs one dict probe per scope instead of
+    # one Python call per scope.
     def get(self, name: str) -> Any:
-        if name in self.values:
-            return self.values[name]
-        if self.enclosing is not None:
-            return self.enclosing.get(name)
+        env = self
+        while env is not None:
+            values = env.values
+            if name in values:
+                return values[name]
+            env = env.enclosing
         raise RuntimeError(f"Undefined variable '{name}'")
 
+    def ancestor(self, depth: int) -> 'Environment':
+        env = self
+        for _ in range(depth):
+            env = env.enclosing
+        return env
+
     def get_type(self, name: str):
-        if name in self.types:
-            return self.types[name]
-        if self.enclosing is not None:
-            return self.enclosing.get_type(name)
+        env = self
+        while env is not None:
+            types = env.types
+            if name in types:
+                return types[name]
+            env = env.enclosing
         return None
 
     def assign(self, name: str, value: Any):
-        if name in self.values:
-            self.values[name] = value
-            return
-        if self.enclosing is not None:
-            self.enclosing.assign(name, value)
-            return
+        env = self
+        while env is not None:
+            values = env.values
+            if name in values:
+                values[name] = value
+                return
+            env = env.enclosing
         raise RuntimeError(f"Undefined variable '{name}'")
 
 
@@ -80,6 +267,15 @@ class Interpreter:
         self.debug = debug
         # cache for loaded modules: modname -> module object
         self.module_cache = {}
+        # value of the `return` currently unwinding to its FunctionCallable
+        self.return_value = None
+        # set once any typed `var` runs; until then assignments skip the
+        # declared-type lookup up the environment chain
+        self.has_typed_vars = False
+        # spare environments for blocks the Resolver marked reusable
+        self._env_pool: List[Environment] = []
+        # import search dir -> names directly inside it (listed on first import)
+        self._dir_entries = {}
         # Bind simple-built-ins
         # input(prompt) -> Python input
         self.environment.define('input', lambda prompt=None: input(prompt if prompt is not None else ''))
@@ -94,10 +290,39 @@ class Interpreter:
         self.environment.define('bool', lambda v: self.coerce_value(v, 'bool'))
         # expose simple scheduler and other helpers via pyspigot import mapping
 
+        # node class -> handler; the parser emits exact node types, so one dict
+        # lookup on type(node) replaces walking an isinstance ladder per node.
+        # Handlers index these dicts directly for their child nodes rather than
+        # going through execute()/evaluate(), which saves a Python call per node
+        self._stmt_handlers = {
+            ExpressionStmt: self._exec_expression,
+            PrintStmt: self._exec_print,
+            VarStmt: self._exec_var,
+            ImportStmt: self._exec_import,
+            BlockStmt: self._exec_block,
+            IfStmt: self._exec_if,
+            WhileStmt: self._exec_while,
+            FunctionStmt: self._exec_function,
+            TryStmt: self._exec_try,
+            Return: self._exec_return,
+        }
+        self._expr_handlers = {
+            Literal: self._eval_literal,
+            Grouping: self._eval_grouping,
+            Unary: self._eval_unary,
+            Binary: self._eval_binary,
+            Variable: self._eval_variable,
+            Call: self._eval_call,
+            Get: self._eval_get,
+            Assign: self._eval_assign,
+        }
+
     def interpret(self, statements: List[Stmt]):
+        Resolver().resolve(statements)
         try:
             for stmt in statements:
-                self.execute(stmt)
+                if self.execute(stmt):
+                    raise RuntimeError("Can't return from top-level code.")
         except Exception as error:
             # If debug mode is enabled, re-raise so the outer runner can print full traceback
             if self.debug:
@@ -109,237 +334,371 @@ class Interpreter:
 
     # --- Statement execution ---
     def execute(self, stmt: Stmt):
-        if isinstance(stmt, ExpressionStmt):
-            self.evaluate(stmt.expression)
-        elif isinstance(stmt, PrintStmt):
-            value = self.evaluate(stmt.expression)
-            print(value)
-        elif isinstance(stmt, VarStmt):
-            value = None
-            if stmt.initializer is not None:
-                value = self.evaluate(stmt.initializer)
-            # if a declared type is present, attempt to coerce the value
-            if getattr(stmt, 'vtype', None) is not None:
-                vtype = stmt.vtype.lexeme
-                value = self.coerce_value(value, vtype)
-                # record type in environment
-                self.environment.types[stmt.name.lexeme] = vtype
-            self.environment.define(stmt.name.lexeme, value)
-        elif isinstance(stmt, ImportStmt):
-            # Support importing other .capla modules by dotted path.
-            parts = [p.lexeme for p in stmt.path]
-            modname = '.'.join(parts)
-            last = parts[-1]
-
-            # return cached module if available
-            if modname in self.module_cache and self.module_cache[modname] is not None:
-                self.environment.define(last, self.module_cache[modname])
-                return
+        handler = self._stmt_handlers.get(type(stmt))
+        if handler is None:
+            raise RuntimeError(f"Unknown statement type: {type(stmt)}")
+        return handler(stmt)
+
+    def _exec_expression(self, stmt: ExpressionStmt):
+        expr = stmt.expression
+        self._expr_handlers[type(expr)](expr)
+
+    def _exec_print(self, stmt: PrintStmt):
+        value = stmt.expression
+        value = self._expr_handlers[type(value)](value)
+        print(value)
+
+    def _exec_var(self, stmt: VarStmt):
+        value = None
+        if stmt.initializer is not None:
+            value = self._expr_handlers[type(stmt.initializer)](stmt.initializer)
+        # if a declared type is present, attempt to coerce the value
+        if getattr(stmt, 'vtype', None) is not None:
+            vtype = stmt.vtype.lexeme
+            value = self.coerce_value(value, vtype)
+            # record type in environment
+            self.environment.types[stmt.name.lexeme] = vtype
+            self.has_typed_vars = True
+        self.environment.define(stmt.name.lexeme, value)
+
+    def _exec_import(self, stmt: ImportStmt):
+        # Support importing other .capla modules by dotted path.
+        parts = [p.lexeme for p in stmt.path]
+        modname = '.'.join(parts)
+        last = parts[-1]
+
+        # return cached module if available; None records a module that failed
+        # to load or is still loading (an import cycle), so neither is retried
+        if modname in self.module_cache:
+            self.environment.define(last, self.module_cache[modname])
+            return
 
-            module_obj = None
+        module_obj = None
 
-            # First try well-known Python alias mappings (e.g., `tk` -> `tkinter`).
-            # This avoids local .capla files shadowing system Python modules
-            # (for example a file named `tk.capla` in the cwd) which would
-            # otherwise cause recursive imports.
-            try:
-                alias_map = {
-                    'tk': 'tkinter',
-                }
-                root_name = parts[0]
-                mapped_name = alias_map.get(root_name, None)
-                if mapped_name is not None:
-                    try:
-                        module = __import__(mapped_name)
-                        for attr in parts[1:]:
-                            module = getattr(module, attr)
-                        module_obj = module
-                        self.module_cache[modname] = module_obj
-                        self.environment.define(last, module_obj)
-                        return
-                    except Exception:
-                        # fall through to attempt loading a .capla module below
-                        module_obj = None
-            except Exception:
-                module_obj = None
-
-            # resolve possible .capla file locations
-            candidates = []
-            repo_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
-            search_dirs = [os.getcwd(), repo_root, os.path.join(repo_root, 'examples')]
-            for base in search_dirs:
-                candidates.append(os.path.join(base, *parts) + '.capla')
-                candidates.append(os.path.join(base, *parts, '__init__.capla'))
+        # First try well-known Python alias mappings (e.g., `tk` -> `tkinter`).
+        # This avoids local .capla files shadowing system Python modules
+        # (for example a file named `tk.capla` in the cwd) which would
+        # otherwise cause recursive imports.
+        try:
+            root_name = parts[0]
+            mapped_name = _PY_ALIASES.get(root_name, None)
+            if mapped_name is not None:
+                try:
+                    module = __import__(mapped_name)
+                    for attr in parts[1:]:
+                        module = getattr(module, attr)
+                    module_obj = module
+                    self.module_cache[modname] = module_obj
+                    self.environment.define(last, module_obj)
+                    return
+                except Exception:
+                    # fall through to attempt loading a .capla module below
+                    module_obj = None
+        except Exception:
+            module_obj = None
 
-            found = None
+        # resolve possible .capla file locations
+        candidates = []
+        listed = []
+        search_dirs = [os.getcwd(), _REPO_ROOT, _EXAMPLES_DIR]
+        for base in search_dirs:
+            paths = (os.path.join(base, *parts) + '.capla',
+                     os.path.join(base, *parts, '__init__.capla'))
+            candidates.extend(paths)
+            # the cached listing finds the usual hits without stat'ing every
+            # candidate path
+            entries = self.search_dir_entries(base)
+            if parts[0] in entries or parts[0] + '.capla' in entries:
+                listed.extend(paths)
+
+        found = None
+        for c in listed:
+            if os.path.isfile(c):
+                found = c
+                break
+        if found is None:
+            # the listing can be stale (a file created since it was taken) or
+            # differ in case on case-insensitive filesystems, so probe directly
             for c in candidates:
                 if os.path.isfile(c):
                     found = c
                     break
 
-            if found is not None:
-                # prevent recursive import loops by marking module as loading
-                self.module_cache[modname] = None
-                try:
-                    from lexer import Lexer
-                    from parser import Parser
-
-                    with open(found, 'r', encoding='utf-8') as mf:
-                        src = mf.read()
+        if found is not None:
+            # prevent recursive import loops by marking module as loading
+            self.module_cache[modname] = None
+            try:
+                stmts = self.load_module_ast(found)
+                Resolver().resolve(stmts)
 
-                    tokens = Lexer(src).scan_tokens()
-                    stmts = Parser(tokens).parse()
+                # execute module in its own environment that can still access globals
+                module_env = Environment(self.environment)
+                self.execute_block(stmts, module_env)
 
-                    # execute module in its own environment that can still access globals
-                    module_env = Environment(self.environment)
-                    self.execute_block(stmts, module_env)
+                # expose module globals as attributes on a module-like object
+                module_obj = CapModule(**module_env.values)
+                self.module_cache[modname] = module_obj
+            except Exception as e:
+                # leave module as None on failure
+                if self.debug:
+                    raise
+                self.module_cache[modname] = None
+        else:
+            # fallback: attempt to import a Python module mapping (pyspigot compatibility)
+            try:
+                # allow common aliasing (e.g., `import tk` -> Python's `tkinter`)
+                # but if no alias mapping was used above, try to import the root name
+                root_name = parts[0]
+                mapped_name = root_name
 
-                    # expose module globals as attributes on a module-like object
-                    module_obj = SimpleNamespace(**module_env.values)
-                    self.module_cache[modname] = module_obj
-                except Exception as e:
-                    # leave module as None on failure
-                    if self.debug:
-                        raise
-                    self.module_cache[modname] = None
-            else:
-                # fallback: attempt to import a Python module mapping (pyspigot compatibility)
-                try:
-                    # allow common aliasing (e.g., `import tk` -> Python's `tkinter`)
-                    # but if no alias mapping was used above, try to import the root name
-                    root_name = parts[0]
-                    mapped_name = root_name
+                module = __import__(mapped_name)
+                for attr in parts[1:]:
+                    module = getattr(module, attr)
+                module_obj = module
+            except Exception:
+                module_obj = None
+            self.module_cache[modname] = module_obj
 
-                    module = __import__(mapped_name)
-                    for attr in parts[1:]:
-                        module = getattr(module, attr)
-                    module_obj = module
-                except Exception:
-                    module_obj = None
-                self.module_cache[modname] = module_obj
+        self.environment.define(last, module_obj)
 
-            self.environment.define(last, module_obj)
-        elif isinstance(stmt, BlockStmt):
-            self.execute_block(stmt.statements, Environment(self.environment))
-        elif isinstance(stmt, IfStmt):
-            cond = self.evaluate(stmt.condition)
-            if self.is_truthy(cond):
-                self.execute(stmt.then_branch)
-            elif stmt.else_branch is not None:
-                self.execute(stmt.else_branch)
-        elif isinstance(stmt, WhileStmt):
-            while self.is_truthy(self.evaluate(stmt.condition)):
-                self.execute(stmt.body)
-        elif isinstance(stmt, FunctionStmt):
-            func = FunctionCallable(stmt, self.environment)
-            self.environment.define(stmt.name.lexeme, func)
-        elif isinstance(stmt, TryStmt):
-            # execute try/catch: try block executes normally, if error occurs run catch block
+    def search_dir_entries(self, base: str) -> set:
+        """Names directly inside an import search dir, listed once per session."""
+        entries = self._dir_entries.get(base)
+        if entries is None:
             try:
-                # execute block statements in a new environment scope
-                self.execute_block(stmt.try_block, Environment(self.environment))
-            except Exception as e:
-                # if catch block present, bind the exception message and execute
-                if stmt.catch_block is not None:
-                    env = Environment(self.environment)
-                    if stmt.catch_param is not None:
-                        # expose the error message as the catch parameter
-                        env.define(stmt.catch_param.lexeme, str(e))
-                    self.execute_block(stmt.catch_block, env)
-                else:
-                    # no catch: re-raise to be handled by outer interpret
-                    raise
-        elif isinstance(stmt, Return):
-            value = None
-            if stmt.value is not None:
-                value = self.evaluate(stmt.value)
-            # unwind via exception
-            raise ReturnException(value)
+                entries = set(os.listdir(base))
+            except OSError:
+                entries = set()
+            self._dir_entries[base] = entries
+        return entries
+
+    def load_module_ast(self, path: str) -> List[Stmt]:
+        """Parse a .capla module, reusing the AST pickled in __pycache__ when it
+        was written for the same source mtime and size.
+        """
+        st = os.stat(path)
+        key = (_AST_CACHE_VERSION, st.st_mtime_ns, st.st_size)
+        cache_dir = os.path.join(os.path.dirname(path), '__pycache__')
+        cache_path = os.path.join(cache_dir, os.path.basename(path) + 'c')
+        try:
+            with open(cache_path, 'rb') as cf:
+                if pickle.load(cf) == key:
+                    return pickle.load(cf)
+        except Exception:
+            pass
+
+        with open(path, 'r', encoding='utf-8') as mf:
+            src = mf.read()
+        stmts = Parser(Lexer(src).scan_tokens()).parse()
+
+        # the cache is best-effort: unwritable dirs or ASTs too deep to pickle
+        # just mean the module is parsed again next time
+        tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(cache_dir, exist_ok=True)
+            with open(tmp_path, 'wb') as cf:
+                pickle.dump(key, cf, pickle.HIGHEST_PROTOCOL)
+                pickle.dump(stmts, cf, pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, cache_path)
+        except Exception:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+        return stmts
+
+    def _exec_block(self, stmt: BlockStmt):
+        if not stmt.reuse_env:
+            return self.execute_block(stmt.statements, Environment(self.environment))
+        # execute_block inlined around a recycled environment
+        previous = self.environment
+        pool = self._env_pool
+        if pool:
+            env = pool.pop()
+            env.enclosing = previous
         else:
-            raise RuntimeError(f"Unknown statement type: {type(stmt)}")
+            env = Environment(previous)
+        self.environment = env
+        handlers = self._stmt_handlers
+        try:
+            for s in stmt.statements:
+                if handlers[type(s)](s):
+                    return _RETURN
+        finally:
+            self.environment = previous
+            env.values.clear()
+            if env.types:
+                env.types.clear()
+            env.enclosing = None
+            pool.append(env)
+
+    def _exec_if(self, stmt: IfStmt):
+        cond = stmt.condition
+        cond = self._expr_handlers[type(cond)](cond)
+        # is_truthy inlined: only nil and false are falsy
+        if cond is not None and cond is not False:
+            branch = stmt.then_branch
+        else:
+            branch = stmt.else_branch
+            if branch is None:
+                return None
+        return self._stmt_handlers[type(branch)](branch)
+
+    def _exec_while(self, stmt: WhileStmt):
+        evaluate = self._expr_handlers[type(stmt.condition)]
+        execute = self._stmt_handlers[type(stmt.body)]
+        condition = stmt.condition
+        body = stmt.body
+        if type(condition) is Literal:
+            # constant condition (`while (true)`, `for (;;)`): test it just once
+            cond = condition.value
+            if cond is None or cond is False:
+                return None
+            while True:
+                if execute(body):
+                    return _RETURN
+        while True:
+            # is_truthy inlined: only nil and false are falsy
+            cond = evaluate(condition)
+            if cond is None or cond is False:
+                break
+            if execute(body):
+                return _RETURN
+
+    def _exec_function(self, stmt: FunctionStmt):
+        if not hasattr(stmt, 'native'):
+            # compiled once per declaration; None unless the body is pure-numeric
+            stmt.native = try_compile(stmt)
+        func = FunctionCallable(stmt, self.environment)
+        self.environment.define(stmt.name.lexeme, func)
+
+    def _exec_try(self, stmt: TryStmt):
+        # execute try/catch: try block executes normally, if error occurs run catch block
+        try:
+            # execute block statements in a new environment scope
+            return self.execute_block(stmt.try_block, Environment(self.environment))
+        except Exception as e:
+            # if catch block present, bind the exception message and execute
+            if stmt.catch_block is not None:
+                env = Environment(self.environment)
+                if stmt.catch_param is not None:
+                    # expose the error message as the catch parameter
+                    env.define(stmt.catch_param.lexeme, str(e))
+                return self.execute_block(stmt.catch_block, env)
+            else:
+                # no catch: re-raise to be handled by outer interpret
+                raise
+
+    def _exec_return(self, stmt: Return):
+        value = stmt.value
+        if value is not None:
+            value = self._expr_handlers[type(value)](value)
+        self.return_value = value
+        return _RETURN
 
     def execute_block(self, statements: List[Stmt], env: Environment):
         previous = self.environment
         try:
             self.environment = env
+            handlers = self._stmt_handlers
             for s in statements:
-                self.execute(s)
+                if handlers[type(s)](s):
+                    return _RETURN
         finally:
             self.environment = previous
 
     # --- Expression evaluation ---
     def evaluate(self, expr: Expr) -> Any:
-        if isinstance(expr, Literal):
-            return expr.value
-
-        if isinstance(expr, Grouping):
-            return self.evaluate(expr.expression)
-
-        if isinstance(expr, Unary):
-            right = self.evaluate(expr.right)
-            if expr.operator.type == TokenType.MINUS:
-                return -float(right)
-            elif expr.operator.type == TokenType.BANG:
-                return not self.is_truthy(right)
-
-        if isinstance(expr, Binary):
-            left = self.evaluate(expr.left)
-            right = self.evaluate(expr.right)
-
-            if expr.operator.type == TokenType.MINUS:
-                return float(left) - float(right)
-            elif expr.operator.type == TokenType.SLASH:
-                return float(left) / float(right)
-            elif expr.operator.type == TokenType.STAR:
-                return float(left) * float(right)
-            elif expr.operator.type == TokenType.PLUS:
-                if isinstance(left, (int, float)) and isinstance(right, (int, float)):
-                    return left + right
-                if isinstance(left, str) and isinstance(right, str):
-                    return left + right
-                raise RuntimeError("Operands must be two numbers or two strings")
-            elif expr.operator.type == TokenType.GREATER:
-                return float(left) > float(right)
-            elif expr.operator.type == TokenType.GREATER_EQUAL:
-                return float(left) >= float(right)
-            elif expr.operator.type == TokenType.LESS:
-                return float(left) < float(right)
-            elif expr.operator.type == TokenType.LESS_EQUAL:
-                return float(left) <= float(right)
-            elif expr.operator.type == TokenType.BANG_EQUAL:
-                return not self.is_equal(left, right)
-            elif expr.operator.type == TokenType.EQUAL_EQUAL:
-                return self.is_equal(left, right)
-
-        if isinstance(expr, Variable):
-            return self.environment.get(expr.name.lexeme)
-
-        if isinstance(expr, Call):
-            callee = self.evaluate(expr.callee)
-            args = [self.evaluate(a) for a in expr.arguments]
-            # support interpreter-declared functions
-            if hasattr(callee, 'call'):
-                return callee.call(self, args)
-
-            if callable(callee):
-                return callee(*args)
-            raise RuntimeError(f"Can only call functions and callable objects")
-
-        if isinstance(expr, Get):
-            obj = self.evaluate(expr.object)
-            try:
-                return getattr(obj, expr.name.lexeme)
-            except Exception:
-                raise RuntimeError(f"Attribute '{expr.name.lexeme}' not found on object")
+        handler = self._expr_handlers.get(type(expr))
+        if handler is None:
+            raise RuntimeError(f"Unknown expression type: {type(expr)}")
+        return handler(expr)
+
+    def _eval_literal(self, expr: Literal) -> Any:
+        return expr.value
+
+    def _eval_grouping(self, expr: Grouping) -> Any:
+        inner = expr.expression
+        return self._expr_handlers[type(inner)](inner)
+
+    def _eval_unary(self, expr: Unary) -> Any:
+        right = expr.right
+        right = self._expr_handlers[type(right)](right)
+        op = expr.op_fn
+        if op is None:
+            op = expr.op_fn = _UNARY_OPS.get(expr.op_type)
+            if op is None:
+                return None
+        return op(right)
+
+    def _eval_binary(self, expr: Binary) -> Any:
+        handlers = self._expr_handlers
+        left = expr.left
+        left = handlers[type(left)](left)
+        right = expr.right
+        right = handlers[type(right)](right)
+        op = expr.op_fn
+        if op is None:
+            op = expr.op_fn = _BINARY_OPS.get(expr.op_type)
+            if op is None:
+                return None
+        return op(left, right)
+
+    def _eval_variable(self, expr: Variable) -> Any:
+        env = self.environment
+        depth = expr.depth
+        while depth:
+            env = env.enclosing
+            depth -= 1
+        name = expr.name.lexeme
+        values = env.values
+        if name in values:
+            return values[name]
+        return env.get(name)
+
+    def _eval_call(self, expr: Call) -> Any:
+        handlers = self._expr_handlers
+        callee = expr.callee
+        callee = handlers[type(callee)](callee)
+        args = [handlers[type(a)](a) for a in expr.arguments]
+        # support interpreter-declared functions; the exact type check spares
+        # the common case a hasattr() probe
+        if type(callee) is FunctionCallable or hasattr(callee, 'call'):
+            return callee.call(self, args)
+
+        if callable(callee):
+            return callee(*args)
+        raise RuntimeError(f"Can only call functions and callable objects")
+
+    def _eval_get(self, expr: Get) -> Any:
+        obj = expr.object
+        obj = self._expr_handlers[type(obj)](obj)
+        if obj is expr.cache_obj:
+            return expr.cache_value
+        try:
+            value = getattr(obj, expr.name.lexeme)
+        except Exception:
+            raise RuntimeError(f"Attribute '{expr.name.lexeme}' not found on object")
+        # CapLang modules are snapshots that nothing rebinds (the language has
+        # no attribute assignment), so their lookups are remembered; anything
+        # Python owns (modules, namespaces, objects) can change under us and
+        # always goes through getattr
+        if type(obj) is CapModule:
+            expr.cache_obj = obj
+            expr.cache_value = value
+        return value
 
-        if isinstance(expr, Assign):
-            value = self.evaluate(expr.value)
-            # if the variable has a declared type, attempt coercion before assigning
-            vtype = self.environment.get_type(expr.name.lexeme)
+    def _eval_assign(self, expr: Assign) -> Any:
+        value = expr.value
+        value = self._expr_handlers[type(value)](value)
+        env = self.environment.ancestor(expr.depth)
+        # if the variable has a declared type, attempt coercion before assigning
+        if self.has_typed_vars:
+            vtype = env.get_type(expr.name.lexeme)
             if vtype is not None:
                 value = self.coerce_value(value, vtype)
-            self.environment.assign(expr.name.lexeme, value)
-            return value
+        env.assign(expr.name.lexeme, value)
+        return value
 
     def coerce_value(self, value: Any, vtype: str) -> Any:
         """Attempt to coerce a runtime value to the declared type name (vtype).
@@ -348,36 +707,13 @@ class Interpreter:
         """
         if vtype is None:
             return value
-        vt = vtype.lower()
+        coerce = _COERCERS.get(vtype.lower())
+        if coerce is None:
+            return value
         try:
-            if vt == 'int':
-                # prefer int when possible, fall back to converting to float
-                try:
-                    return int(value)
-                except Exception:
-                    try:
-                        return int(float(value))
-                    except Exception:
-                        return float(value)
-            if vt == 'float':
-                return float(value)
-            if vt in ('string', 'str'):
-                return str(value)
-            if vt == 'bool':
-                if isinstance(value, bool):
-                    return value
-                if isinstance(value, str):
-                    v = value.strip().lower()
-                    if v in ('true', '1', 'yes'):
-                        return True
-                    if v in ('false', '0', 'no'):
-                        return False
-                return bool(value)
+            return coerce(value)
         except Exception as e:
             raise RuntimeError(f"Cannot coerce value {value!r} to type '{vtype}': {e}")
-        return value
-
-        raise RuntimeError(f"Unknown expression type: {type(expr)}")
 
     def is_truthy(self, object: Any) -> bool:
         if object is None:
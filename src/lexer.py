@@ -1,6 +1,13 @@
-from enum import Enum, auto
+import re
+import sys
+from enum import Enum, IntEnum, auto
+
+class TokenType(IntEnum):
+    # IntEnum so dict lookups keyed by token type hash in C (Enum.__hash__ is
+    # Python-level); str()/format() keep the TokenType.NAME spelling.
+    __str__ = Enum.__str__
+    __format__ = Enum.__format__
 
-class TokenType(Enum):
     # Keywords
     DEF = auto()
     CLASS = auto()
@@ -52,7 +59,81 @@ class TokenType(Enum):
     # End of file
     EOF = auto()
 
+# Character class bits. Code points below 256 are looked up in _CHAR_CLASS,
+# built from the same str predicates the scanner has always used; anything
+# above falls back to calling them.
+_SPACE = 1
+_ID_START = 2   # isalpha() or '_'
+_ID_CONT = 4    # isalnum() or '_'
+_DIGIT = 8      # isdigit()
+
+
+def _classify(c: str) -> int:
+    bits = 0
+    if c.isspace():
+        bits |= _SPACE
+    if c.isalpha() or c == '_':
+        bits |= _ID_START
+    if c.isalnum() or c == '_':
+        bits |= _ID_CONT
+    if c.isdigit():
+        bits |= _DIGIT
+    return bits
+
+
+_CHAR_CLASS = bytes(_classify(chr(i)) for i in range(256))
+
+
+def _char_class(c: str) -> int:
+    o = ord(c)
+    return _CHAR_CLASS[o] if o < 256 else _classify(c)
+
+
+# Master pattern for the common (ASCII) case, tried at each position before
+# falling back to the character scanner. The lookaheads stop names and numbers
+# from matching a shorter prefix, and make them refuse to end next to a
+# non-ASCII character so Unicode identifiers/digits, which the str predicates
+# above accept, still go through scan_token whole.
+_TOKEN_RE = re.compile(r"""
+    (?P<space>[ \t\r\n]+)
+  | (?P<comment>(?://|\#)[^\n]*)
+  | (?P<name>[A-Za-z_][A-Za-z0-9_]*)(?![A-Za-z0-9_]|[^\x00-\x7f])
+  | (?P<number>[0-9]+(?:\.[0-9]+)?)(?![0-9]|\.[0-9]|\.?[^\x00-\x7f])
+  | (?P<string>"[^"]*")
+  | (?P<op>[=!<>]=?|[(){},.;+\-*/])
+""", re.VERBOSE)
+
+_SPACE_GROUP = _TOKEN_RE.groupindex['space']
+_COMMENT_GROUP = _TOKEN_RE.groupindex['comment']
+_NAME_GROUP = _TOKEN_RE.groupindex['name']
+_NUMBER_GROUP = _TOKEN_RE.groupindex['number']
+_STRING_GROUP = _TOKEN_RE.groupindex['string']
+
+_OPERATORS = {
+    '(': TokenType.LEFT_PAREN,
+    ')': TokenType.RIGHT_PAREN,
+    '{': TokenType.LEFT_BRACE,
+    '}': TokenType.RIGHT_BRACE,
+    ',': TokenType.COMMA,
+    '.': TokenType.DOT,
+    ';': TokenType.SEMICOLON,
+    '+': TokenType.PLUS,
+    '-': TokenType.MINUS,
+    '*': TokenType.STAR,
+    '/': TokenType.SLASH,
+    '=': TokenType.EQUAL,
+    '==': TokenType.EQUAL_EQUAL,
+    '!': TokenType.BANG,
+    '!=': TokenType.BANG_EQUAL,
+    '<': TokenType.LESS,
+    '<=': TokenType.LESS_EQUAL,
+    '>': TokenType.GREATER,
+    '>=': TokenType.GREATER_EQUAL,
+}
+
 class Token:
+    __slots__ = ('type', 'lexeme', 'literal', 'line')
+
     def __init__(self, type: TokenType, lexeme: str, literal: object, line: int):
         self.type = type
         self.lexeme = lexeme
@@ -95,26 +176,64 @@ class Lexer:
         })
 
     def scan_tokens(self):
-        while not self.is_at_end():
+        source = self.source
+        end = len(source)
+        tokens = self.tokens
+        keywords = self.keywords
+        match = _TOKEN_RE.match
+        while self.current < end:
             self.start = self.current
-            self.scan_token()
+            m = match(source, self.current)
+            if m is None:
+                # non-ASCII names/digits, stray characters and unterminated
+                # strings go through the character scanner
+                self.scan_token()
+                continue
+            self.current = m.end()
+            group = m.lastindex
+            if group == _SPACE_GROUP:
+                self.line += m.group().count('\n')
+            elif group == _NAME_GROUP:
+                # interned so every use of a name shares one string object
+                text = sys.intern(m.group())
+                tokens.append(Token(keywords.get(text, TokenType.IDENTIFIER), text, None, self.line))
+            elif group == _NUMBER_GROUP:
+                text = m.group()
+                tokens.append(Token(TokenType.NUMBER, text, float(text), self.line))
+            elif group == _STRING_GROUP:
+                text = m.group()
+                self.line += text.count('\n')
+                tokens.append(Token(TokenType.STRING, text, text[1:-1], self.line))
+            elif group != _COMMENT_GROUP:
+                text = m.group()
+                tokens.append(Token(_OPERATORS[text], text, None, self.line))
             
         self.tokens.append(Token(TokenType.EOF, "", None, self.line))
         return self.tokens
 
     def scan_token(self):
         c = self.advance()
-        
-        if c.isspace():
-            if c == '\n':
-                self.line += 1
+        cls = _char_class(c)
+
+        if cls & _SPACE:
+            # consume the whole whitespace run in one go
+            source = self.source
+            end = len(source)
+            current = self.current
+            newlines = c == '\n'
+            while current < end and _char_class(source[current]) & _SPACE:
+                if source[current] == '\n':
+                    newlines += 1
+                current += 1
+            self.current = current
+            self.line += newlines
             return
-            
-        if c.isalpha() or c == '_':
+
+        if cls & _ID_START:
             self.identifier()
             return
-            
-        if c.isdigit():
+
+        if cls & _DIGIT:
             self.number()
             return
             
@@ -146,15 +265,13 @@ class Lexer:
         elif c == '/':
             # support '//' line comments
             if self.match('/'):
-                while self.peek() != '\n' and not self.is_at_end():
-                    self.advance()
+                self.skip_line()
                 return
             self.add_token(TokenType.SLASH)
             return
         elif c == '#':
             # hash-style comments until end of line
-            while self.peek() != '\n' and not self.is_at_end():
-                self.advance()
+            self.skip_line()
             return
         elif c == '=':
             self.add_token(TokenType.EQUAL_EQUAL if self.match('=') else TokenType.EQUAL)
@@ -168,34 +285,53 @@ class Lexer:
             raise Exception(f"Unexpected character at line {self.line}")
 
     def identifier(self):
-        while self.peek().isalnum() or self.peek() == '_':
-            self.advance()
-            
-        text = self.source[self.start:self.current]
+        # scan with locals rather than peek()/advance() calls per character
+        source = self.source
+        end = len(source)
+        current = self.current
+        table = _CHAR_CLASS
+        while current < end:
+            o = ord(source[current])
+            if not ((table[o] if o < 256 else _classify(source[current])) & _ID_CONT):
+                break
+            current += 1
+        self.current = current
+
+        # interned so every use of a name shares one string object, letting the
+        # interpreter's environment dicts match keys by identity
+        text = sys.intern(self.source[self.start:self.current])
         type = self.keywords.get(text, TokenType.IDENTIFIER)
-        self.add_token(type)
+        self.tokens.append(Token(type, text, None, self.line))
 
     def number(self):
-        while self.peek().isdigit():
-            self.advance()
-            
-        if self.peek() == '.' and self.peek_next().isdigit():
-            self.advance()
-            while self.peek().isdigit():
-                self.advance()
-                
+        source = self.source
+        end = len(source)
+        current = self.current
+        while current < end and _char_class(source[current]) & _DIGIT:
+            current += 1
+
+        if (current + 1 < end and source[current] == '.'
+                and _char_class(source[current + 1]) & _DIGIT):
+            current += 2
+            while current < end and _char_class(source[current]) & _DIGIT:
+                current += 1
+        self.current = current
+
         self.add_token(TokenType.NUMBER, float(self.source[self.start:self.current]))
 
+    def skip_line(self):
+        # move to the newline ending the current line (or the end of input)
+        newline = self.source.find('\n', self.current)
+        self.current = len(self.source) if newline < 0 else newline
+
     def string(self):
-        while self.peek() != '"' and not self.is_at_end():
-            if self.peek() == '\n':
-                self.line += 1
-            self.advance()
-            
-        if self.is_at_end():
+        close = self.source.find('"', self.current)
+        if close < 0:
+            self.line += self.source.count('\n', self.current)
+            self.current = len(self.source)
             raise Exception(f"Unterminated string at line {self.line}")
-            
-        self.advance()  # Closing quote
+        self.line += self.source.count('\n', self.current, close)
+        self.current = close + 1  # past the closing quote
         
         value = self.source[self.start + 1:self.current - 1]
         self.add_token(TokenType.STRING, value)
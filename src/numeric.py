@@ -0,0 +1,104 @@
+import io
+import math
+from typing import Callable, Optional, Set
+from parser import (
+    Binary, Grouping, Literal, Unary, Variable, Expr, Assign,
+    Stmt, ExpressionStmt, VarStmt, BlockStmt, IfStmt, WhileStmt, FunctionStmt, Return
+)
+from lexer import TokenType
+from compiler import Compiler
+
+# Fast path for pure-numeric CapLang functions: a function that only does float
+# arithmetic and comparisons on its parameters and its own locals behaves the
+# same as the Python the Compiler emits for it, as long as every argument is a
+# float. Such functions are compiled once and called directly instead of being
+# walked by the interpreter.
+
+_ARITH_OPS = {TokenType.PLUS, TokenType.MINUS, TokenType.STAR, TokenType.SLASH}
+_COMPARE_OPS = {TokenType.GREATER, TokenType.GREATER_EQUAL, TokenType.LESS, TokenType.LESS_EQUAL}
+_EQUALITY_OPS = {TokenType.EQUAL_EQUAL, TokenType.BANG_EQUAL}
+
+
+def _is_number(expr: Expr, names: Set[str]) -> bool:
+    if isinstance(expr, Literal):
+        return type(expr.value) is float and math.isfinite(expr.value)
+    if isinstance(expr, Variable):
+        return expr.name.lexeme in names
+    if isinstance(expr, Grouping):
+        return _is_number(expr.expression, names)
+    if isinstance(expr, Unary):
+        return expr.operator.type == TokenType.MINUS and _is_number(expr.right, names)
+    if isinstance(expr, Binary):
+        return (expr.operator.type in _ARITH_OPS
+                and _is_number(expr.left, names) and _is_number(expr.right, names))
+    return False
+
+
+def _is_bool(expr: Expr, names: Set[str]) -> bool:
+    if isinstance(expr, Literal):
+        return type(expr.value) is bool
+    if isinstance(expr, Grouping):
+        return _is_bool(expr.expression, names)
+    if isinstance(expr, Unary):
+        return expr.operator.type == TokenType.BANG and _is_bool(expr.right, names)
+    if isinstance(expr, Binary):
+        if expr.operator.type in _COMPARE_OPS:
+            return _is_number(expr.left, names) and _is_number(expr.right, names)
+        if expr.operator.type in _EQUALITY_OPS:
+            return ((_is_number(expr.left, names) and _is_number(expr.right, names))
+                    or (_is_bool(expr.left, names) and _is_bool(expr.right, names)))
+    return False
+
+
+def _is_pure(stmt: Stmt, names: Set[str], top_level: bool) -> bool:
+    # `names` holds the float locals declared so far; it grows as the body is walked
+    # in order, so a name can't be read before its declaration
+    if isinstance(stmt, VarStmt):
+        # locals only at the top of the body, so block scoping can't differ
+        # from Python's function-wide locals
+        name = stmt.name.lexeme
+        if not top_level or name in names or getattr(stmt, 'vtype', None) is not None:
+            return False
+        if stmt.initializer is None or not _is_number(stmt.initializer, names):
+            return False
+        names.add(name)
+        return True
+    if isinstance(stmt, ExpressionStmt):
+        expr = stmt.expression
+        return (isinstance(expr, Assign) and expr.name.lexeme in names
+                and _is_number(expr.value, names))
+    if isinstance(stmt, BlockStmt):
+        return all(_is_pure(s, names, False) for s in stmt.statements)
+    if isinstance(stmt, IfStmt):
+        return (_is_bool(stmt.condition, names)
+                and _is_pure(stmt.then_branch, names, False)
+                and (stmt.else_branch is None or _is_pure(stmt.else_branch, names, False)))
+    if isinstance(stmt, WhileStmt):
+        return _is_bool(stmt.condition, names) and _is_pure(stmt.body, names, False)
+    if isinstance(stmt, Return):
+        return (stmt.value is None or _is_number(stmt.value, names)
+                or _is_bool(stmt.value, names))
+    return False
+
+
+def try_compile(stmt: FunctionStmt) -> Optional[Callable]:
+    """Compile a pure-numeric function to a Python function.
+
+    Returns None when the function uses anything beyond float locals, arithmetic,
+    comparisons, if/while and return. The result is only valid for float arguments.
+    """
+    names = set(stmt.param_names)
+    if len(names) != len(stmt.param_names):
+        return None
+    if not all(_is_pure(s, names, True) for s in stmt.body):
+        return None
+
+    writer = io.StringIO()
+    Compiler().compile_stmt(stmt, writer)
+    namespace = {'__builtins__': {}}
+    try:
+        exec(writer.getvalue(), namespace)
+    except SyntaxError:
+        # e.g. a CapLang identifier that is a Python keyword
+        return None
+    return namespace[stmt.name.lexeme]
@@ -1,131 +1,247 @@
+import gc
 from typing import List, Any, Optional
 from lexer import Token, TokenType
 
+# placeholder for Get.cache_obj before any lookup has been cached
+_NO_CACHE = object()
+
 # Expression nodes
 class Expr:
-    pass
+    __slots__ = ()
 
 class Binary(Expr):
+    __slots__ = ('left', 'operator', 'right', 'op_type', 'op_fn')
+
     def __init__(self, left: Expr, operator: Token, right: Expr):
         self.left = left
         self.operator = operator
         self.right = right
+        # operator token type, cached to skip the Token indirection when evaluating
+        self.op_type = operator.type
+        # operator implementation (set by the Interpreter on first evaluation)
+        self.op_fn = None
 
 class Grouping(Expr):
+    __slots__ = ('expression',)
+
     def __init__(self, expression: Expr):
         self.expression = expression
 
 class Literal(Expr):
+    __slots__ = ('value',)
+
     def __init__(self, value: Any):
         self.value = value
 
 class Unary(Expr):
+    __slots__ = ('operator', 'right', 'op_type', 'op_fn')
+
     def __init__(self, operator: Token, right: Expr):
         self.operator = operator
         self.right = right
+        self.op_type = operator.type
+        self.op_fn = None
 
 class Variable(Expr):
+    __slots__ = ('name', 'depth')
+
     def __init__(self, name: Token):
         self.name = name
+        # scopes to skip before looking the name up (set by the Resolver)
+        self.depth = 0
 
 class Assign(Expr):
+    __slots__ = ('name', 'value', 'depth')
+
     def __init__(self, name: Token, value: Expr):
         self.name = name
         self.value = value
+        # scopes to skip before looking the name up (set by the Resolver)
+        self.depth = 0
 
 class Function(Expr):
+    __slots__ = ('name', 'params', 'body')
+
     def __init__(self, name: Token, params: List[Token], body: List['Stmt']):
         self.name = name
         self.params = params
         self.body = body
 
 class ReturnStmt(Expr):
+    __slots__ = ('value',)
+
     def __init__(self, value: Optional[Expr]):
         self.value = value
 
 class Get(Expr):
+    __slots__ = ('object', 'name', 'cache_obj', 'cache_value')
+
     def __init__(self, object: Expr, name: Token):
         self.object = object
         self.name = name
+        # last module looked up and the attribute it gave (set by the Interpreter);
+        # a private sentinel so no runtime value (nil included) hits the empty cache
+        self.cache_obj = _NO_CACHE
+        self.cache_value = None
 
 class Call(Expr):
+    __slots__ = ('callee', 'arguments')
+
     def __init__(self, callee: Expr, arguments: List[Expr]):
         self.callee = callee
-        self.arguments = arguments
+        # a tuple iterates a little faster than a list on every call
+        self.arguments = tuple(arguments)
 
 # Statement nodes
 class Stmt:
-    pass
+    __slots__ = ()
 
 class ExpressionStmt(Stmt):
+    __slots__ = ('expression',)
+
     def __init__(self, expression: Expr):
         self.expression = expression
 
 class PrintStmt(Stmt):
+    __slots__ = ('expression',)
+
     def __init__(self, expression: Expr):
         self.expression = expression
 
 class FunctionStmt(Stmt):
+    # `native` stays unset until the Interpreter first tries to compile it
+    __slots__ = ('name', 'params', 'body', 'param_names', 'reuse_env', 'native')
+
     def __init__(self, name: Token, params: List[Token], body: List[Stmt]):
         self.name = name
         self.params = params
         self.body = body
+        # parameter names, read on every call
+        self.param_names = tuple(p.lexeme for p in params)
+        # True when nothing in the body can capture a call's environment, so
+        # calls may recycle it (set by the Resolver)
+        self.reuse_env = False
 
 class Return(Stmt):
+    __slots__ = ('value',)
+
     def __init__(self, value: Optional[Expr]):
         self.value = value
 
 class VarStmt(Stmt):
+    __slots__ = ('name', 'initializer', 'vtype')
+
     def __init__(self, name: Token, initializer: Optional[Expr], vtype: Optional[Token] = None):
         self.name = name
         self.initializer = initializer
         self.vtype = vtype
 
 class ImportStmt(Stmt):
+    __slots__ = ('path',)
+
     def __init__(self, path: List[Token]):
         self.path = path
 
 class BlockStmt(Stmt):
+    __slots__ = ('statements', 'reuse_env')
+
     def __init__(self, statements: List[Stmt]):
         self.statements = statements
+        # True when nothing can capture the block's environment, so the
+        # interpreter may recycle it (set by the Resolver)
+        self.reuse_env = False
 
 class IfStmt(Stmt):
+    __slots__ = ('condition', 'then_branch', 'else_branch')
+
     def __init__(self, condition: Expr, then_branch: Stmt, else_branch: Optional[Stmt]):
         self.condition = condition
         self.then_branch = then_branch
         self.else_branch = else_branch
 
 class WhileStmt(Stmt):
+    __slots__ = ('condition', 'body')
+
     def __init__(self, condition: Expr, body: Stmt):
         self.condition = condition
         self.body = body
 
 class TryStmt(Stmt):
+    __slots__ = ('try_block', 'catch_param', 'catch_block')
+
     def __init__(self, try_block: List[Stmt], catch_param: Optional[Token], catch_block: Optional[List[Stmt]]):
         self.try_block = try_block
         self.catch_param = catch_param
         self.catch_block = catch_block
 
 
+# Token types the parser tests on nearly every token, bound once:
+# attribute lookups on the TokenType enum class are several times slower
+# than reading a module global.
+_IDENTIFIER = TokenType.IDENTIFIER
+_NUMBER = TokenType.NUMBER
+_STRING = TokenType.STRING
+_LEFT_PAREN = TokenType.LEFT_PAREN
+_RIGHT_PAREN = TokenType.RIGHT_PAREN
+_COMMA = TokenType.COMMA
+_DOT = TokenType.DOT
+_EQUAL = TokenType.EQUAL
+_EOF = TokenType.EOF
+
+_UNARY_OPERATORS = frozenset((TokenType.BANG, TokenType.MINUS))
+
+# Literal nodes are never modified after parsing, so every true/false/nil in
+# a program shares one node per value
+_LITERAL_FALSE = Literal(False)
+_LITERAL_TRUE = Literal(True)
+_LITERAL_NIL = Literal(None)
+
+_KEYWORD_LITERALS = {
+    TokenType.FALSE: _LITERAL_FALSE,
+    TokenType.TRUE: _LITERAL_TRUE,
+    TokenType.NIL: _LITERAL_NIL,
+}
+
+# binding strength of each binary operator (higher binds tighter)
+_BINARY_PRECEDENCE = {
+    TokenType.BANG_EQUAL: 1,
+    TokenType.EQUAL_EQUAL: 1,
+    TokenType.GREATER: 2,
+    TokenType.GREATER_EQUAL: 2,
+    TokenType.LESS: 2,
+    TokenType.LESS_EQUAL: 2,
+    TokenType.MINUS: 3,
+    TokenType.PLUS: 3,
+    TokenType.SLASH: 4,
+    TokenType.STAR: 4,
+}
+
+
 class Parser:
     def __init__(self, tokens: List[Token]):
         self.tokens = tokens
         self.current = 0
 
     def parse(self) -> List[Stmt]:
-        statements: List[Stmt] = []
-        while not self.is_at_end():
-            statements.append(self.declaration())
-        return statements
+        # the tree only grows while parsing and nothing in it is garbage yet,
+        # so cyclic GC passes over the new nodes would find nothing to free
+        gc_was_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            statements: List[Stmt] = []
+            while not self.is_at_end():
+                statements.append(self.declaration())
+            return statements
+        finally:
+            if gc_was_enabled:
+                gc.enable()
 
     # --- Declarations / statements ---
     def declaration(self) -> Stmt:
-        if self.match(TokenType.VAR):
-            return self.var_declaration()
-        if self.match(TokenType.DEF):
-            return self.function_declaration()
-        if self.match(TokenType.IMPORT):
-            return self.import_declaration()
+        handler = self._decl_handlers.get(self.tokens[self.current].type)
+        if handler is not None:
+            self.current += 1
+            return handler(self)
         return self.statement()
 
     def import_declaration(self) -> Stmt:
@@ -167,23 +283,16 @@ class Parser:
         return VarStmt(name, initializer, vtype)
 
     def statement(self) -> Stmt:
-        if self.match(TokenType.TRY):
-            return self.try_statement()
-        if self.match(TokenType.PRINT):
-            return self.print_statement()
-        if self.match(TokenType.RETURN):
-            return self.return_statement()
-        if self.match(TokenType.FOR):
-            return self.for_statement()
-        if self.match(TokenType.IF):
-            return self.if_statement()
-        if self.match(TokenType.WHILE):
-            return self.while_statement()
-        if self.match(TokenType.LEFT_BRACE):
-            return BlockStmt(self.block())
+        handler = self._stmt_handlers.get(self.tokens[self.current].type)
+        if handler is not None:
+            self.current += 1
+            return handler(self)
 
         return self.expression_statement()
 
+    def block_statement(self) -> BlockStmt:
+        return BlockStmt(self.block())
+
     def print_statement(self) -> PrintStmt:
         expr = self.expression()
         if self.match(TokenType.SEMICOLON):
@@ -280,7 +389,7 @@ class Parser:
             body = BlockStmt([body, ExpressionStmt(increment)])
 
         if condition is None:
-            condition = Literal(True)
+            condition = _LITERAL_TRUE
 
         body = WhileStmt(condition, body)
 
@@ -319,64 +428,50 @@ class Parser:
         return self.assignment()
 
     def assignment(self) -> Expr:
-        expr = self.equality()
-
-        if self.match(TokenType.EQUAL):
-            equals = self.previous()
-            value = self.assignment()
-
-            if isinstance(expr, Variable):
-                name = expr.name
-                return Assign(name, value)
-
-            raise Exception(f"Invalid assignment target at line {equals.line}")
-
-        return expr
-
-    def equality(self) -> Expr:
-        expr = self.comparison()
-
-        while self.match(TokenType.BANG_EQUAL, TokenType.EQUAL_EQUAL):
-            operator = self.previous()
-            right = self.comparison()
-            expr = Binary(expr, operator, right)
+        expr = self.binary(1)
+        tokens = self.tokens
+
+        # `a = b = c` collects its targets left to right, then folds them
+        # right to left, so long chains don't recurse once per `=`
+        targets: List[Token] = []
+        equals = tokens[self.current]
+        while equals.type is _EQUAL:
+            self.current += 1
+            value = self.binary(1)
 
-        return expr
+            if not isinstance(expr, Variable):
+                raise Exception(f"Invalid assignment target at line {equals.line}")
 
-    def comparison(self) -> Expr:
-        expr = self.term()
+            targets.append(expr.name)
+            expr = value
+            equals = tokens[self.current]
 
-        while self.match(TokenType.GREATER, TokenType.GREATER_EQUAL,
-                        TokenType.LESS, TokenType.LESS_EQUAL):
-            operator = self.previous()
-            right = self.term()
-            expr = Binary(expr, operator, right)
+        for name in reversed(targets):
+            expr = Assign(name, expr)
 
         return expr
 
-    def term(self) -> Expr:
-        expr = self.factor()
-
-        while self.match(TokenType.MINUS, TokenType.PLUS):
-            operator = self.previous()
-            right = self.factor()
-            expr = Binary(expr, operator, right)
-
-        return expr
-
-    def factor(self) -> Expr:
+    def binary(self, min_precedence: int) -> Expr:
+        # precedence climbing: one loop per operand instead of one method per
+        # precedence level; every binary operator is left-associative
         expr = self.unary()
+        tokens = self.tokens
 
-        while self.match(TokenType.SLASH, TokenType.STAR):
-            operator = self.previous()
-            right = self.unary()
+        while True:
+            operator = tokens[self.current]
+            precedence = _BINARY_PRECEDENCE.get(operator.type)
+            if precedence is None or precedence < min_precedence:
+                break
+            self.current += 1
+            right = self.binary(precedence + 1)
             expr = Binary(expr, operator, right)
 
         return expr
 
     def unary(self) -> Expr:
-        if self.match(TokenType.BANG, TokenType.MINUS):
-            operator = self.previous()
+        operator = self.tokens[self.current]
+        if operator.type in _UNARY_OPERATORS:
+            self.current += 1
             right = self.unary()
             return Unary(operator, right)
 
@@ -384,21 +479,26 @@ class Parser:
 
     def call(self) -> Expr:
         expr = self.primary()
+        tokens = self.tokens
 
         while True:
-            if self.match(TokenType.LEFT_PAREN):
+            type = tokens[self.current].type
+            if type is _LEFT_PAREN:
+                self.current += 1
                 # parse arguments
                 args: List[Expr] = []
-                if not self.check(TokenType.RIGHT_PAREN):
+                if tokens[self.current].type is not _RIGHT_PAREN:
                     args.append(self.expression())
-                    while self.match(TokenType.COMMA):
+                    while tokens[self.current].type is _COMMA:
+                        self.current += 1
                         args.append(self.expression())
 
                 self.consume(TokenType.RIGHT_PAREN, "Expect ')' after arguments.")
                 expr = Call(expr, args)
                 continue
 
-            if self.match(TokenType.DOT):
+            if type is _DOT:
+                self.current += 1
                 name = self.consume(TokenType.IDENTIFIER, "Expect property name after '.'.")
                 expr = Get(expr, name)
                 continue
@@ -408,38 +508,41 @@ class Parser:
         return expr
 
     def primary(self) -> Expr:
-        if self.match(TokenType.FALSE):
-            return Literal(False)
-        if self.match(TokenType.TRUE):
-            return Literal(True)
-        if self.match(TokenType.NIL):
-            return Literal(None)
+        token = self.tokens[self.current]
+        type = token.type
 
-        if self.match(TokenType.NUMBER, TokenType.STRING):
-            return Literal(self.previous().literal)
+        if type is _IDENTIFIER:
+            self.current += 1
+            return Variable(token)
 
-        if self.match(TokenType.IDENTIFIER):
-            return Variable(self.previous())
+        if type is _NUMBER or type is _STRING:
+            self.current += 1
+            return Literal(token.literal)
 
-        if self.match(TokenType.LEFT_PAREN):
+        if type in _KEYWORD_LITERALS:
+            self.current += 1
+            return _KEYWORD_LITERALS[type]
+
+        if type is _LEFT_PAREN:
+            self.current += 1
             expr = self.expression()
             self.consume(TokenType.RIGHT_PAREN, "Expect ')' after expression.")
             return Grouping(expr)
 
-        raise Exception(f"Expected expression at line {self.peek().line}")
+        raise Exception(f"Expected expression at line {token.line}")
 
     # --- Utility parsing helpers ---
     def match(self, *types: TokenType) -> bool:
-        for type in types:
-            if self.check(type):
-                self.advance()
-                return True
+        # one containment test instead of a check() per type; callers never
+        # ask for EOF, so being at the end needs no separate test
+        if self.tokens[self.current].type in types:
+            self.current += 1
+            return True
         return False
 
     def check(self, type: TokenType) -> bool:
-        if self.is_at_end():
-            return False
-        return self.peek().type == type
+        current = self.tokens[self.current].type
+        return current is type and current is not _EOF
 
     def advance(self) -> Token:
         if not self.is_at_end():
@@ -447,7 +550,7 @@ class Parser:
         return self.previous()
 
     def is_at_end(self) -> bool:
-        return self.peek().type == TokenType.EOF
+        return self.tokens[self.current].type is _EOF
 
     def peek(self) -> Token:
         return self.tokens[self.current]
@@ -459,4 +562,23 @@ class Parser:
         if self.check(type):
             return self.advance()
 
-        raise Exception(f"{message} at line {self.peek().line}")
\ No newline at end of file
+        raise Exception(f"{message} at line {self.peek().line}")
+
+    # leading keyword -> method parsing the rest of the declaration or
+    # statement; one dict lookup replaces a match() per alternative. Kept on
+    # the class (plain functions, not bound methods) so a Parser holds no
+    # reference cycle and its token list is freed as soon as it goes away.
+    _decl_handlers = {
+        TokenType.VAR: var_declaration,
+        TokenType.DEF: function_declaration,
+        TokenType.IMPORT: import_declaration,
+    }
+    _stmt_handlers = {
+        TokenType.TRY: try_statement,
+        TokenType.PRINT: print_statement,
+        TokenType.RETURN: return_statement,
+        TokenType.FOR: for_statement,
+        TokenType.IF: if_statement,
+        TokenType.WHILE: while_statement,
+        TokenType.LEFT_BRACE: block_statement,
+    }
@@ -0,0 +1,130 @@
+from typing import Dict, List
+from parser import (
+    Binary, Grouping, Unary, Variable, Expr, Assign, Call, Get,
+    Stmt, ExpressionStmt, PrintStmt, VarStmt, BlockStmt, IfStmt, WhileStmt, ImportStmt,
+    FunctionStmt, Return, TryStmt
+)
+
+
+class Resolver:
+    """Static pass that records, on each Variable/Assign node, how many
+    enclosing environments can be skipped when looking the name up.
+
+    Block, function, try and catch scopes are tracked; program and module top
+    level stay dynamic. Names declared later in a scope they're used from keep
+    depth 0 (the plain walk), so closures over later definitions still work.
+    """
+
+    def __init__(self):
+        # one dict per tracked scope: name -> declared yet (in program order)
+        self.scopes: List[Dict[str, bool]] = []
+        # function/import statements seen so far; both keep a reference to the
+        # environment they run in, so scopes containing one can't be recycled
+        self.captures = 0
+
+    def resolve(self, statements: List[Stmt]):
+        for stmt in statements:
+            self.resolve_stmt(stmt)
+
+    # --- Scopes ---
+    def begin_scope(self, statements: List[Stmt]):
+        # names declared anywhere directly in this scope are known up front so
+        # a use before the declaration doesn't resolve past it
+        scope: Dict[str, bool] = {}
+        for stmt in statements:
+            if isinstance(stmt, (VarStmt, FunctionStmt)):
+                scope.setdefault(stmt.name.lexeme, False)
+            elif isinstance(stmt, ImportStmt):
+                scope.setdefault(stmt.path[-1].lexeme, False)
+        self.scopes.append(scope)
+
+    def end_scope(self):
+        self.scopes.pop()
+
+    def declare(self, name: str):
+        if self.scopes:
+            self.scopes[-1][name] = True
+
+    def resolve_name(self, name: str) -> int:
+        hops = 0
+        for scope in reversed(self.scopes):
+            declared = scope.get(name)
+            if declared is not None:
+                # declared later in this scope: leave it to the dynamic walk
+                return hops if declared else 0
+            hops += 1
+        return hops
+
+    def resolve_scope(self, statements: List[Stmt]):
+        self.begin_scope(statements)
+        self.resolve(statements)
+        self.end_scope()
+
+    # --- Statements ---
+    def resolve_stmt(self, stmt: Stmt):
+        if isinstance(stmt, ExpressionStmt):
+            self.resolve_expr(stmt.expression)
+        elif isinstance(stmt, PrintStmt):
+            self.resolve_expr(stmt.expression)
+        elif isinstance(stmt, VarStmt):
+            if stmt.initializer is not None:
+                self.resolve_expr(stmt.initializer)
+            self.declare(stmt.name.lexeme)
+        elif isinstance(stmt, ImportStmt):
+            self.captures += 1
+            self.declare(stmt.path[-1].lexeme)
+        elif isinstance(stmt, BlockStmt):
+            captures = self.captures
+            self.resolve_scope(stmt.statements)
+            stmt.reuse_env = self.captures == captures
+        elif isinstance(stmt, IfStmt):
+            self.resolve_expr(stmt.condition)
+            self.resolve_stmt(stmt.then_branch)
+            if stmt.else_branch is not None:
+                self.resolve_stmt(stmt.else_branch)
+        elif isinstance(stmt, WhileStmt):
+            self.resolve_expr(stmt.condition)
+            self.resolve_stmt(stmt.body)
+        elif isinstance(stmt, FunctionStmt):
+            self.declare(stmt.name.lexeme)
+            # parameters and body share one environment at call time
+            captures = self.captures
+            self.begin_scope(stmt.body)
+            for param in stmt.params:
+                self.declare(param.lexeme)
+            self.resolve(stmt.body)
+            self.end_scope()
+            stmt.reuse_env = self.captures == captures
+            self.captures += 1
+        elif isinstance(stmt, TryStmt):
+            self.resolve_scope(stmt.try_block)
+            if stmt.catch_block is not None:
+                self.begin_scope(stmt.catch_block)
+                if stmt.catch_param is not None:
+                    self.declare(stmt.catch_param.lexeme)
+                self.resolve(stmt.catch_block)
+                self.end_scope()
+        elif isinstance(stmt, Return):
+            if stmt.value is not None:
+                self.resolve_expr(stmt.value)
+
+    # --- Expressions ---
+    def resolve_expr(self, expr: Expr):
+        if isinstance(expr, Variable):
+            expr.depth = self.resolve_name(expr.name.lexeme)
+        elif isinstance(expr, Assign):
+            self.resolve_expr(expr.value)
+            expr.depth = self.resolve_name(expr.name.lexeme)
+        elif isinstance(expr, Binary):
+            self.resolve_expr(expr.left)
+            self.resolve_expr(expr.right)
+        elif isinstance(expr, Grouping):
+            self.resolve_expr(expr.expression)
+        elif isinstance(expr, Unary):
+            self.resolve_expr(expr.right)
+        elif isinstance(expr, Call):
+            self.resolve_expr(expr.callee)
+            for arg in expr.arguments:
+                self.resolve_expr(arg)
+        elif isinstance(expr, Get):
+            self.resolve_expr(expr.object)
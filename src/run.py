@@ -6,31 +6,139 @@ import time
 # Ensure src directory is on sys.path so local imports work when running this script
 sys.path.insert(0, os.path.dirname(__file__))
 
-from lexer import Lexer
-from parser import Parser, ExpressionStmt
-from interpreter import Interpreter
-from compiler import Compiler
-import ast
+# The CapLang front end and backends, `ast` and `hashlib` are imported where
+# they're used: each mode only pays for the modules it needs, and a cached
+# compile run loads none of them
+import marshal
 from typing import List
 
+# stored with each marshalled code object in __pycache__; bump it whenever the
+# Compiler's output changes so caches written by older code are recompiled
+_CODE_CACHE_VERSION = 1
+
+
+def _code_cache_path(path: str) -> str:
+    return os.path.join(os.path.dirname(path), '__pycache__', os.path.basename(path) + '.pyc')
+
+
+def code_cache_key(path: str) -> tuple:
+    # marshal's format is tied to the Python version, hence the cache tag
+    st = os.stat(path)
+    return (_CODE_CACHE_VERSION, sys.implementation.cache_tag, st.st_mtime_ns, st.st_size)
+
+
+def load_cached_code(path: str, key: tuple):
+    """Return the code object compiled from `path` last time, or None when
+    there is no cache or it was written for a different source or Python.
+    """
+    try:
+        with open(_code_cache_path(path), 'rb') as cf:
+            if marshal.load(cf) == key:
+                return marshal.load(cf)
+    except Exception:
+        pass
+    return None
+
+
+def store_cached_code(path: str, key: tuple, code) -> None:
+    # best-effort, like the interpreter's module AST cache
+    cache_path = _code_cache_path(path)
+    tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        with open(tmp_path, 'wb') as cf:
+            marshal.dump(key, cf)
+            marshal.dump(code, cf)
+        os.replace(tmp_path, cache_path)
+    except Exception:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+
+
+def _original_py_path(path: str) -> str:
+    # an adjacent original_<basename>.py is written out instead of the compiled code
+    base = os.path.splitext(os.path.basename(path))[0]
+    return os.path.join(os.path.dirname(path), f"original_{base}.py")
+
+
+def compiled_output_header(path: str, source: str) -> str:
+    """First line of a `--out` file: a digest of everything the file is
+    generated from, so an unchanged source needn't be compiled again.
+    """
+    import hashlib
+
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(f"{_CODE_CACHE_VERSION}\0{os.path.dirname(os.path.abspath(__file__))}\0".encode())
+    digest.update(source.encode('utf-8'))
+    original_py = _original_py_path(path)
+    if os.path.exists(original_py):
+        with open(original_py, 'rb') as rf:
+            digest.update(b"\0")
+            digest.update(rf.read())
+    return f"# cap-lang-src-hash: {digest.hexdigest()}\n"
+
+
+def output_is_current(out: str, header: str) -> bool:
+    try:
+        with open(out, 'r', encoding='utf-8') as f:
+            return f.readline() == header
+    except (OSError, UnicodeDecodeError):
+        return False
+
+
+def run_compiled(code) -> int:
+    # execute compiled code in a namespace that exposes 'sleep'
+    namespace = {'sleep': time.sleep}
+    try:
+        exec(code, namespace)
+    except Exception as e:
+        print(f"Error running compiled code: {e}")
+        return 2
+    return 0
+
 
 def run_file(path: str, mode: str, out: str | None = None, debug: bool = False):
+    cache_key = None
+    if mode == 'compile' and not out:
+        # re-running an unchanged file skips both CapLang and Python parsing
+        cache_key = code_cache_key(path)
+        code = load_cached_code(path, cache_key)
+        if code is not None:
+            return run_compiled(code)
+
     with open(path, 'r', encoding='utf-8') as f:
         source = f.read()
 
-    tokens = Lexer(source).scan_tokens()
-    statements = Parser(tokens).parse()
+    if mode == 'compile' and out:
+        # compared against the digest line of the existing output; mtimes
+        # alone can't tell an unchanged source from a restored one
+        header = compiled_output_header(path, source)
+        if output_is_current(out, header):
+            print(f"{out} is up to date")
+            return 0
+
+    from lexer import Lexer
+    from parser import Parser, ExpressionStmt
+
+    # the token list isn't kept past the parse (most tokens live on in the AST)
+    statements = Parser(Lexer(source).scan_tokens()).parse()
 
     if not statements:
         print("Parsing produced no statements.")
         return 1
 
     if mode == 'run':
+        from interpreter import Interpreter
+
         interp = Interpreter(debug=debug)
         success = interp.interpret(statements)
         return 0 if success else 1
 
     elif mode == 'compile':
+        from compiler import Compiler
+
         comp = Compiler()
         # If the program is a single expression statement, print its value for convenience
         if len(statements) == 1 and isinstance(statements[0], ExpressionStmt):
@@ -48,15 +156,14 @@ def run_file(path: str, mode: str, out: str | None = None, debug: bool = False):
                 # when executed from any subfolder. We compute the repo root here (relative to src/run.py)
                 repo_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
                 bootstrap = (
+                    header +
                     "import sys, os\n"
                     f"sys.path.insert(0, {repr(repo_root)})\n\n"
                 )
 
                 # If an adjacent original_<basename>.py exists next to the source, prefer that
                 # as the compiled output so we produce the original, canonical plugin file.
-                src_dir = os.path.dirname(path)
-                base = os.path.splitext(os.path.basename(path))[0]
-                original_py = os.path.join(src_dir, f"original_{base}.py")
+                original_py = _original_py_path(path)
 
                 if os.path.exists(original_py):
                     with open(original_py, 'r', encoding='utf-8') as rf:
@@ -75,15 +182,14 @@ def run_file(path: str, mode: str, out: str | None = None, debug: bool = False):
                 return 2
             return 0
 
-        # Otherwise, execute the compiled code in a namespace that exposes 'sleep'
-        namespace = {'sleep': time.sleep}
+        # Otherwise, compile once to a code object, cache it and execute it
         try:
-            exec(python_code, namespace)
-        except Exception as e:
+            code = compile(python_code, path, 'exec')
+        except SyntaxError as e:
             print(f"Error running compiled code: {e}")
             return 2
-
-        return 0
+        store_cached_code(path, cache_key, code)
+        return run_compiled(code)
 
     else:
         print(f"Unknown mode: {mode}. Use 'run' or 'compile'.")
@@ -97,6 +203,8 @@ def translate_python_to_capla(py_path: str, out_path: str | None = None):
     calls, and returns. It is intentionally conservative and will skip nodes it
     doesn't understand.
     """
+    import ast
+
     with open(py_path, 'r', encoding='utf-8') as f:
         src = f.read()
 
@@ -104,79 +212,134 @@ def translate_python_to_capla(py_path: str, out_path: str | None = None):
 
     lines: List[str] = []
 
-    def expr_to_cap(e: ast.expr) -> str:
-        if isinstance(e, ast.Constant):
-            return repr(e.value)
-        if isinstance(e, ast.Name):
-            return e.id
-        if isinstance(e, ast.Call):
-            func = expr_to_cap(e.func)
-            args = ", ".join(expr_to_cap(a) for a in e.args)
-            return f"{func}({args})"
-        if isinstance(e, ast.Attribute):
-            return f"{expr_to_cap(e.value)}.{e.attr}"
-        if isinstance(e, ast.BinOp) and isinstance(e.op, ast.Add):
-            return f"({expr_to_cap(e.left)} + {expr_to_cap(e.right)})"
+    # The emit_* functions append their pieces to `out` so nested expressions
+    # are joined once, not re-copied into a new string at every level
+    def emit_constant(e: ast.Constant, out: List[str]):
+        out.append(repr(e.value))
+
+    def emit_name(e: ast.Name, out: List[str]):
+        out.append(e.id)
+
+    def emit_call(e: ast.Call, out: List[str]):
+        emit_expr(e.func, out)
+        out.append("(")
+        for i, a in enumerate(e.args):
+            if i:
+                out.append(", ")
+            emit_expr(a, out)
+        out.append(")")
+
+    def emit_attribute(e: ast.Attribute, out: List[str]):
+        emit_expr(e.value, out)
+        out.append(".")
+        out.append(e.attr)
+
+    def emit_binop(e: ast.BinOp, out: List[str]):
+        if not isinstance(e.op, ast.Add):
+            emit_unsupported(e, out)
+            return
+        out.append("(")
+        emit_expr(e.left, out)
+        out.append(" + ")
+        emit_expr(e.right, out)
+        out.append(")")
+
+    def emit_unsupported(e: ast.expr, out: List[str]):
         # fallback
-        return "nil"
+        out.append("nil")
 
-    def stmt_to_cap(s: ast.stmt, indent: int = 0):
-        pad = "    " * indent
-        if isinstance(s, ast.ImportFrom):
-            module = s.module if s.module else ''
-            for n in s.names:
-                # translate `from pyspigot import X` -> `import pyspigot.X`
-                if module:
-                    parts = module.split('.') + [n.name]
-                    lines.append(pad + f"import {'.'.join(parts)}")
-                else:
-                    lines.append(pad + f"import {n.name}")
-        elif isinstance(s, ast.FunctionDef):
-            params = ", ".join(a.arg for a in s.args.args)
-            lines.append(pad + f"def {s.name}({params}) {{")
-            for sub in s.body:
-                stmt_to_cap(sub, indent + 1)
-            lines.append(pad + "}")
-        elif isinstance(s, ast.Expr):
-            # expression statement
-            if isinstance(s.value, ast.Call):
-                call = expr_to_cap(s.value)
-                # map print calls
-                if isinstance(s.value.func, ast.Name) and s.value.func.id == 'print':
-                    if s.value.args:
-                        lines.append(pad + f"print {expr_to_cap(s.value.args[0])}")
-                    else:
-                        lines.append(pad + "print \"\"")
-                else:
-                    lines.append(pad + call)
+    expr_emitters = {
+        ast.Constant: emit_constant,
+        ast.Name: emit_name,
+        ast.Call: emit_call,
+        ast.Attribute: emit_attribute,
+        ast.BinOp: emit_binop,
+    }
+
+    def emit_expr(e: ast.expr, out: List[str]):
+        expr_emitters.get(type(e), emit_unsupported)(e, out)
+
+    def expr_to_cap(e: ast.expr) -> str:
+        out: List[str] = []
+        emit_expr(e, out)
+        return "".join(out)
+
+    def import_from_to_cap(s: ast.ImportFrom, pad: str, indent: int):
+        module = s.module if s.module else ''
+        for n in s.names:
+            # translate `from pyspigot import X` -> `import pyspigot.X`
+            if module:
+                parts = module.split('.') + [n.name]
+                lines.append(pad + f"import {'.'.join(parts)}")
             else:
-                lines.append(pad + expr_to_cap(s.value))
-        elif isinstance(s, ast.Assign):
-            if len(s.targets) == 1 and isinstance(s.targets[0], ast.Name):
-                name = s.targets[0].id
-                val = expr_to_cap(s.value)
-                # use var for top-level assignments
-                lines.append(pad + f"var {name} = {val}")
-        elif isinstance(s, ast.Return):
-            if s.value:
-                lines.append(pad + f"return {expr_to_cap(s.value)}")
+                lines.append(pad + f"import {n.name}")
+
+    def function_def_to_cap(s: ast.FunctionDef, pad: str, indent: int):
+        params = ", ".join(a.arg for a in s.args.args)
+        lines.append(pad + f"def {s.name}({params}) {{")
+        for sub in s.body:
+            stmt_to_cap(sub, indent + 1)
+        lines.append(pad + "}")
+
+    def expr_stmt_to_cap(s: ast.Expr, pad: str, indent: int):
+        # expression statement
+        if isinstance(s.value, ast.Call):
+            call = expr_to_cap(s.value)
+            # map print calls
+            if isinstance(s.value.func, ast.Name) and s.value.func.id == 'print':
+                if s.value.args:
+                    lines.append(pad + f"print {expr_to_cap(s.value.args[0])}")
+                else:
+                    lines.append(pad + "print \"\"")
             else:
-                lines.append(pad + "return")
-        elif isinstance(s, ast.If):
-            # simple if with condition
-            cond = expr_to_cap(s.test)
-            lines.append(pad + f"if ({cond}) {{")
-            for ss in s.body:
+                lines.append(pad + call)
+        else:
+            lines.append(pad + expr_to_cap(s.value))
+
+    def assign_to_cap(s: ast.Assign, pad: str, indent: int):
+        if len(s.targets) == 1 and isinstance(s.targets[0], ast.Name):
+            name = s.targets[0].id
+            val = expr_to_cap(s.value)
+            # use var for top-level assignments
+            lines.append(pad + f"var {name} = {val}")
+
+    def return_to_cap(s: ast.Return, pad: str, indent: int):
+        if s.value:
+            lines.append(pad + f"return {expr_to_cap(s.value)}")
+        else:
+            lines.append(pad + "return")
+
+    def if_to_cap(s: ast.If, pad: str, indent: int):
+        # simple if with condition
+        cond = expr_to_cap(s.test)
+        lines.append(pad + f"if ({cond}) {{")
+        for ss in s.body:
+            stmt_to_cap(ss, indent + 1)
+        lines.append(pad + "}")
+        if s.orelse:
+            lines.append(pad + "else {")
+            for ss in s.orelse:
                 stmt_to_cap(ss, indent + 1)
             lines.append(pad + "}")
-            if s.orelse:
-                lines.append(pad + "else {")
-                for ss in s.orelse:
-                    stmt_to_cap(ss, indent + 1)
-                lines.append(pad + "}")
-        else:
-            # unsupported statement: emit a comment with the node type
-            lines.append(pad + f"# unsupported: {type(s).__name__}")
+
+    def unsupported_to_cap(s: ast.stmt, pad: str, indent: int):
+        # unsupported statement: emit a comment with the node type
+        lines.append(pad + f"# unsupported: {type(s).__name__}")
+
+    # statement node class -> translation; one dict lookup per statement
+    # instead of an isinstance ladder
+    stmt_handlers = {
+        ast.ImportFrom: import_from_to_cap,
+        ast.FunctionDef: function_def_to_cap,
+        ast.Expr: expr_stmt_to_cap,
+        ast.Assign: assign_to_cap,
+        ast.Return: return_to_cap,
+        ast.If: if_to_cap,
+    }
+
+    def stmt_to_cap(s: ast.stmt, indent: int = 0):
+        handler = stmt_handlers.get(type(s), unsupported_to_cap)
+        handler(s, "    " * indent, indent)
 
     for node in tree.body:
         stmt_to_cap(node, 0)
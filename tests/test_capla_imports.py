@@ -0,0 +1,46 @@
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from lexer import Lexer
+from parser import Parser
+from interpreter import Interpreter
+
+
+class CaplaImportTest(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.dir = self._tmp.name
+        self._cwd = os.getcwd()
+        os.chdir(self.dir)
+
+    def tearDown(self):
+        os.chdir(self._cwd)
+        self._tmp.cleanup()
+
+    def write(self, name: str, text: str):
+        with open(os.path.join(self.dir, name), 'w', encoding='utf-8') as f:
+            f.write(text)
+
+    def run_in(self, interp: Interpreter, source: str) -> str:
+        out = io.StringIO()
+        with contextlib.redirect_stdout(out):
+            interp.interpret(Parser(Lexer(source).scan_tokens()).parse())
+        return out.getvalue()
+
+    def test_module_created_after_first_import_is_found(self):
+        interp = Interpreter()
+        self.write('first_mod.capla', 'var name = "first"\n')
+        self.assertEqual(self.run_in(interp, 'import first_mod\nprint first_mod.name\n'), 'first\n')
+        # the cwd listing is cached by now; a new file must still be picked up
+        self.write('later_mod.capla', 'var name = "later"\n')
+        self.assertEqual(self.run_in(interp, 'import later_mod\nprint later_mod.name\n'), 'later\n')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,84 @@
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from lexer import Lexer
+from parser import Parser
+from interpreter import Interpreter
+
+
+def run_capla(source: str) -> str:
+    out = io.StringIO()
+    with contextlib.redirect_stdout(out):
+        Interpreter().interpret(Parser(Lexer(source).scan_tokens()).parse())
+    return out.getvalue()
+
+
+class GetCacheTest(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.dir = self._tmp.name
+        self._cwd = os.getcwd()
+        # .capla modules are looked up in the cwd, Python modules on sys.path
+        os.chdir(self.dir)
+        sys.path.insert(0, self.dir)
+
+    def tearDown(self):
+        os.chdir(self._cwd)
+        sys.path.remove(self.dir)
+        sys.modules.pop('pymod_state', None)
+        sys.modules.pop('nsmod', None)
+        self._tmp.cleanup()
+
+    def write(self, name: str, text: str):
+        with open(os.path.join(self.dir, name), 'w', encoding='utf-8') as f:
+            f.write(text)
+
+    def test_nil_object_raises(self):
+        out = run_capla('var n = nil;\nprint n.v;\nprint n.v;\n')
+        self.assertEqual(out, "Runtime error: Attribute 'v' not found on object\n")
+
+    def test_python_module_globals_are_reread(self):
+        self.write('pymod_state.py', 'value = 0\n\ndef bump():\n    global value\n    value += 1\n')
+        out = run_capla(
+            'import pymod_state\n'
+            'var i = 0;\n'
+            'while (i < 3) { pymod_state.bump(); print pymod_state.value; i = i + 1; }\n'
+        )
+        self.assertEqual(out.split(), ['1', '2', '3'])
+
+    def test_python_namespace_attributes_are_reread(self):
+        self.write('nsmod.py', (
+            'from types import SimpleNamespace\n\n'
+            'state = SimpleNamespace(count=0)\n\n'
+            'def bump():\n    state.count += 1\n'
+        ))
+        out = run_capla(
+            'import nsmod\n'
+            'var i = 0;\n'
+            'while (i < 3) { nsmod.bump(); print nsmod.state.count; i = i + 1; }\n'
+        )
+        self.assertEqual(out.split(), ['1', '2', '3'])
+
+    def test_capla_module_lookups(self):
+        self.write('capmod_a.capla', 'var name = "a"\ndef add(x, y) {\n    return x + y\n}\n')
+        self.write('capmod_b.capla', 'var name = "b"\n')
+        out = run_capla(
+            'import capmod_a\n'
+            'import capmod_b\n'
+            'def show(m) {\n    print m.name\n}\n'
+            'var i = 0;\n'
+            'while (i < 2) { print capmod_a.add(i, 1); i = i + 1; }\n'
+            # one Get node seeing two different modules refreshes its cache
+            'show(capmod_a);\nshow(capmod_b);\nshow(capmod_a);\n'
+        )
+        self.assertEqual(out.split(), ['1.0', '2.0', 'a', 'b', 'a'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,58 @@
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'py2capla'))
+
+from py2capla import duplicate_outputs, main
+
+
+class DuplicateOutputsTest(unittest.TestCase):
+    def test_same_basename_into_out_dir_clashes(self):
+        clashes = duplicate_outputs(['a/x.py', 'b/x.py', 'c/y.py'], 'out')
+        self.assertEqual(len(clashes), 1)
+        out, inputs = clashes[0]
+        self.assertEqual(os.path.basename(out), 'x.capla')
+        self.assertEqual(inputs, ['a/x.py', 'b/x.py'])
+
+    def test_outputs_next_to_inputs_dont_clash(self):
+        self.assertEqual(duplicate_outputs(['a/x.py', 'b/x.py']), [])
+
+    def test_same_input_spelled_twice_clashes(self):
+        self.assertEqual(len(duplicate_outputs(['a/x.py', './a/x.py'])), 1)
+
+
+class DirectoryModeTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.src_dir = os.path.join(self.tmp.name, 'scripts')
+        os.mkdir(self.src_dir)
+        with open(os.path.join(self.src_dir, 'only.py'), 'w') as f:
+            f.write('x = 1\n')
+
+    def run_main(self, argv):
+        with contextlib.redirect_stdout(io.StringIO()):
+            main(argv)
+
+    def test_glob_with_single_match_writes_into_new_dir(self):
+        out_dir = os.path.join(self.tmp.name, 'out_dir')
+        self.run_main(['-i', os.path.join(self.src_dir, '*.py'), '-o', out_dir, '-j', '1'])
+        self.assertTrue(os.path.isfile(os.path.join(out_dir, 'only.capla')))
+
+    def test_single_file_into_existing_dir(self):
+        out_dir = os.path.join(self.tmp.name, 'out_dir')
+        os.mkdir(out_dir)
+        self.run_main(['-i', os.path.join(self.src_dir, 'only.py'), '-o', out_dir, '-j', '1'])
+        self.assertTrue(os.path.isfile(os.path.join(out_dir, 'only.capla')))
+
+    def test_jobs_below_one_is_rejected(self):
+        with contextlib.redirect_stderr(io.StringIO()), self.assertRaises(SystemExit):
+            main(['-i', os.path.join(self.src_dir, 'only.py'), '-j', '0'])
+
+
+if __name__ == '__main__':
+    unittest.main()